@@ -127,7 +127,9 @@ def main():
     pytest_args = []
     
     if args.parallel:
-        pytest_args.extend(["-n", "auto"])  # Use all CPU cores
+        # Use all CPU cores; tests sharing an xdist_group (module-scoped
+        # state) stay together on one worker
+        pytest_args.extend(["-n", "auto", "--dist=loadgroup"])
     
     if args.keyword:
         pytest_args.extend(["-k", args.keyword])
@@ -14,6 +14,103 @@ import re
 from utils.logger import setup_logger
 
 
+# Counts matches for several CSS selectors in a single round-trip to the browser
+_COUNT_SELECTORS_JS = '''
+    (selectors) => Object.fromEntries(
+        selectors.map(s => [s, document.querySelectorAll(s).length])
+    )
+'''
+
+# Selectors for interactive elements and the attributes recorded for each match
+_INTERACTIVE_SELECTORS = [
+    'button',
+    'a[href]',
+    'input',
+    'select',
+    'textarea',
+    '[role="button"]',
+    '[onclick]',
+    '[data-testid]'
+]
+
+_ELEMENT_ATTRIBUTES = ['id', 'class', 'name', 'data-testid', 'aria-label', 'placeholder', 'href', 'type']
+
+# Collects text, state and attributes of every match in one round-trip; visibility
+# and enablement follow Playwright's is_visible()/is_enabled() rules
+_EXTRACT_ELEMENTS_JS = '''
+    ({selectors, attributes}) => selectors.flatMap(selector =>
+        Array.from(document.querySelectorAll(selector), (el, index) => {
+            const rect = el.getBoundingClientRect();
+            const attrs = {};
+            for (const name of attributes) {
+                const value = el.getAttribute(name);
+                if (value) attrs[name] = value;
+            }
+            return {
+                selector,
+                index,
+                text: el.textContent || '',
+                type: el.tagName.toLowerCase(),
+                visible: rect.width > 0 && rect.height > 0 &&
+                    getComputedStyle(el).visibility !== 'hidden',
+                enabled: !el.matches(':disabled'),
+                attributes: attrs
+            };
+        })
+    )
+'''
+
+_ACCESSIBILITY_SELECTORS = [
+    'h1, h2, h3, h4, h5, h6',
+    '[aria-label], [aria-describedby], [role]',
+    'img',
+    'img[alt]',
+    '[tabindex]'
+]
+
+_PAGE_TYPE_SELECTORS = ['input[type="password"]', 'form', 'table']
+
+# URL keywords per page type, checked in order
+_PAGE_TYPE_URL_KEYWORDS = (
+    ('login', ('login', 'signin', 'auth')),
+    ('dashboard', ('dashboard', 'home', 'index')),
+    ('form', ('form', 'create', 'new', 'add')),
+    ('listing', ('list', 'table', 'grid')),
+    ('profile', ('profile', 'account', 'settings'))
+)
+
+_FORM_FIELD_SELECTORS = ('input', 'select', 'textarea')
+
+_NAVIGATION_SELECTORS = (
+    'nav a',
+    'header a',
+    '[role="navigation"] a',
+    '.nav a',
+    '.navbar a',
+    '.menu a'
+)
+
+_LOGIN_INDICATORS = (
+    'input[type="password"]',
+    'input[name*="password"]',
+    'input[name*="username"]',
+    'input[name*="email"]',
+    'button:has-text("Login")',
+    'button:has-text("Sign in")'
+)
+
+_LOGOUT_INDICATORS = (
+    'button:has-text("Logout")',
+    'button:has-text("Sign out")',
+    'a:has-text("Logout")',
+    'a:has-text("Sign out")'
+)
+
+_CLICKABLE_SELECTOR = 'button, a, [onclick], [role="button"]'
+_FILLABLE_SELECTOR = 'input[type="text"], input[type="email"], textarea'
+_SELECTABLE_SELECTOR = 'select, input[type="checkbox"], input[type="radio"]'
+
+
 class IntelligentPageAnalyzer:
     """
     Analyzes web pages to extract information needed for test generation
@@ -34,7 +131,7 @@ class IntelligentPageAnalyzer:
         Returns:
             Dictionary containing page analysis data
         """
-        self.logger.info(f"Analyzing page: {page.url}")
+        self.logger.info("Analyzing page: %s", page.url)
         
         # Get page content and metadata
         url = page.url
@@ -46,71 +143,52 @@ class IntelligentPageAnalyzer:
         # Extract viewport information
         viewport = page.viewport_size
         
+        # The sub-analyses are independent read-only queries, so run them concurrently
+        (
+            elements, forms, navigation, api_endpoints, authentication,
+            page_type, interactions, accessibility, performance_metrics
+        ) = await asyncio.gather(
+            self._extract_elements(page),
+            self._analyze_forms(page),
+            self._extract_navigation(page),
+            self._detect_api_endpoints(page),
+            self._detect_authentication(page),
+            self._determine_page_type(page),
+            self._detect_interactions(page),
+            self._analyze_accessibility(page),
+            self._get_performance_metrics(page)
+        )
+        
         # Analyze the page structure
         analysis = {
             'url': url,
             'title': title,
             'viewport': viewport,
-            'elements': await self._extract_elements(page),
-            'forms': await self._analyze_forms(page),
-            'navigation': await self._extract_navigation(page),
-            'api_endpoints': await self._detect_api_endpoints(page),
-            'authentication': await self._detect_authentication(page),
-            'page_type': await self._determine_page_type(page),
-            'interactions': await self._detect_interactions(page),
-            'accessibility': await self._analyze_accessibility(page),
-            'performance_metrics': await self._get_performance_metrics(page)
+            'elements': elements,
+            'forms': forms,
+            'navigation': navigation,
+            'api_endpoints': api_endpoints,
+            'authentication': authentication,
+            'page_type': page_type,
+            'interactions': interactions,
+            'accessibility': accessibility,
+            'performance_metrics': performance_metrics
         }
         
         return analysis
     
     async def _extract_elements(self, page: Page) -> List[Dict[str, Any]]:
         """Extract all interactive elements from the page"""
-        elements = []
-        
-        # Define selectors for interactive elements
-        interactive_selectors = [
-            'button',
-            'a[href]',
-            'input',
-            'select',
-            'textarea',
-            '[role="button"]',
-            '[onclick]',
-            '[data-testid]'
-        ]
-        
-        for selector in interactive_selectors:
-            try:
-                locators = page.locator(selector)
-                count = await locators.count()
-                
-                for i in range(count):
-                    element = locators.nth(i)
-                    
-                    # Get element properties
-                    element_data = {
-                        'selector': selector,
-                        'index': i,
-                        'text': await element.text_content() or '',
-                        'type': await element.evaluate('el => el.tagName.toLowerCase()'),
-                        'visible': await element.is_visible(),
-                        'enabled': await element.is_enabled(),
-                        'attributes': {}
-                    }
-                    
-                    # Get specific attributes
-                    for attr in ['id', 'class', 'name', 'data-testid', 'aria-label', 'placeholder', 'href', 'type']:
-                        value = await element.get_attribute(attr)
-                        if value:
-                            element_data['attributes'][attr] = value
-                    
-                    elements.append(element_data)
-                    
-            except Exception as e:
-                self.logger.debug(f"Error extracting {selector}: {str(e)}")
-        
-        return elements
+        try:
+            elements = await page.evaluate(_EXTRACT_ELEMENTS_JS, {
+                'selectors': _INTERACTIVE_SELECTORS,
+                'attributes': _ELEMENT_ATTRIBUTES
+            })
+        except Exception as e:
+            self.logger.debug("Error extracting elements: %s", e)
+            return []
+        
+        return list(elements or [])
     
     async def _analyze_forms(self, page: Page) -> List[Dict[str, Any]]:
         """Analyze all forms on the page"""
@@ -130,8 +208,7 @@ class IntelligentPageAnalyzer:
             }
             
             # Get all form fields
-            field_selectors = ['input', 'select', 'textarea']
-            for selector in field_selectors:
+            for selector in _FORM_FIELD_SELECTORS:
                 fields = form.locator(selector)
                 field_count = await fields.count()
                 
@@ -155,16 +232,7 @@ class IntelligentPageAnalyzer:
         navigation = []
         
         # Look for common navigation patterns
-        nav_selectors = [
-            'nav a',
-            'header a',
-            '[role="navigation"] a',
-            '.nav a',
-            '.navbar a',
-            '.menu a'
-        ]
-        
-        for selector in nav_selectors:
+        for selector in _NAVIGATION_SELECTORS:
             try:
                 links = page.locator(selector)
                 count = await links.count()
@@ -216,30 +284,14 @@ class IntelligentPageAnalyzer:
         }
         
         # Check for login forms
-        login_indicators = [
-            'input[type="password"]',
-            'input[name*="password"]',
-            'input[name*="username"]',
-            'input[name*="email"]',
-            'button:has-text("Login")',
-            'button:has-text("Sign in")'
-        ]
-        
-        for indicator in login_indicators:
+        for indicator in _LOGIN_INDICATORS:
             count = await page.locator(indicator).count()
             if count > 0:
                 auth_info['has_login_form'] = True
                 break
         
         # Check for logout elements
-        logout_indicators = [
-            'button:has-text("Logout")',
-            'button:has-text("Sign out")',
-            'a:has-text("Logout")',
-            'a:has-text("Sign out")'
-        ]
-        
-        for indicator in logout_indicators:
+        for indicator in _LOGOUT_INDICATORS:
             count = await page.locator(indicator).count()
             if count > 0:
                 auth_info['has_logout_button'] = True
@@ -254,23 +306,17 @@ class IntelligentPageAnalyzer:
         title = (await page.title()).lower()
         
         # Check URL patterns
-        if any(pattern in url for pattern in ['login', 'signin', 'auth']):
-            return 'login'
-        elif any(pattern in url for pattern in ['dashboard', 'home', 'index']):
-            return 'dashboard'
-        elif any(pattern in url for pattern in ['form', 'create', 'new', 'add']):
-            return 'form'
-        elif any(pattern in url for pattern in ['list', 'table', 'grid']):
-            return 'listing'
-        elif any(pattern in url for pattern in ['profile', 'account', 'settings']):
-            return 'profile'
+        for page_type, keywords in _PAGE_TYPE_URL_KEYWORDS:
+            if any(keyword in url for keyword in keywords):
+                return page_type
         
         # Check page content
-        if await page.locator('input[type="password"]').count() > 0:
+        counts = await self._count_selectors(page, _PAGE_TYPE_SELECTORS)
+        if counts['input[type="password"]'] > 0:
             return 'login'
-        elif await page.locator('form').count() > 2:
+        elif counts['form'] > 2:
             return 'form'
-        elif await page.locator('table').count() > 0:
+        elif counts['table'] > 0:
             return 'listing'
         
         return 'generic'
@@ -285,15 +331,15 @@ class IntelligentPageAnalyzer:
         }
         
         # Clickable elements
-        clickable = await page.locator('button, a, [onclick], [role="button"]').all()
+        clickable = await page.locator(_CLICKABLE_SELECTOR).all()
         interactions['clickable'] = [await el.get_attribute('data-testid') or await el.text_content() or 'unnamed' for el in clickable[:10]]
         
         # Fillable elements
-        fillable = await page.locator('input[type="text"], input[type="email"], textarea').all()
+        fillable = await page.locator(_FILLABLE_SELECTOR).all()
         interactions['fillable'] = [await el.get_attribute('name') or await el.get_attribute('id') or 'unnamed' for el in fillable[:10]]
         
         # Selectable elements
-        selectable = await page.locator('select, input[type="checkbox"], input[type="radio"]').all()
+        selectable = await page.locator(_SELECTABLE_SELECTOR).all()
         interactions['selectable'] = [await el.get_attribute('name') or await el.get_attribute('id') or 'unnamed' for el in selectable[:10]]
         
         return interactions
@@ -308,25 +354,29 @@ class IntelligentPageAnalyzer:
             'color_contrast_ok': None  # Would need more complex analysis
         }
         
+        counts = await self._count_selectors(page, _ACCESSIBILITY_SELECTORS)
+        
         # Check headings hierarchy
-        headings = await page.locator('h1, h2, h3, h4, h5, h6').count()
-        accessibility['has_proper_headings'] = headings > 0
+        accessibility['has_proper_headings'] = counts['h1, h2, h3, h4, h5, h6'] > 0
         
         # Check ARIA labels
-        aria_elements = await page.locator('[aria-label], [aria-describedby], [role]').count()
-        accessibility['has_aria_labels'] = aria_elements > 0
+        accessibility['has_aria_labels'] = counts['[aria-label], [aria-describedby], [role]'] > 0
         
         # Check alt text on images
-        images = await page.locator('img').count()
-        images_with_alt = await page.locator('img[alt]').count()
+        images = counts['img']
+        images_with_alt = counts['img[alt]']
         accessibility['has_alt_text'] = images == 0 or images_with_alt > 0
         
         # Check for keyboard navigation indicators
-        tabindex_elements = await page.locator('[tabindex]').count()
-        accessibility['keyboard_navigable'] = tabindex_elements > 0
+        accessibility['keyboard_navigable'] = counts['[tabindex]'] > 0
         
         return accessibility
     
+    async def _count_selectors(self, page: Page, selectors: List[str]) -> Dict[str, int]:
+        """Count elements matching each CSS selector with one page.evaluate call"""
+        counts = await page.evaluate(_COUNT_SELECTORS_JS, selectors) or {}
+        return {selector: counts.get(selector, 0) for selector in selectors}
+    
     async def _get_performance_metrics(self, page: Page) -> Dict[str, Any]:
         """Get basic performance metrics"""
         metrics = await page.evaluate('''
@@ -1,16 +1,130 @@
 """Pattern Analyzer - Analyzes web page structure and identifies interaction patterns."""
 
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional, Set, Tuple
-from dataclasses import dataclass, asdict
+import sys
+from collections import OrderedDict
+from typing import Dict, Any, FrozenSet, List, Mapping, Optional, Sequence, Set, Tuple
+from dataclasses import dataclass, asdict, field
 from bs4 import BeautifulSoup, Tag
 import re
 from urllib.parse import urlparse, urljoin
 
 logger = logging.getLogger(__name__)
 
+# lxml's C parser builds the tree far faster than the pure-Python html.parser
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
 
-@dataclass
+# Fast non-cryptographic hash for the analysis cache key, when available
+try:
+    import xxhash
+
+    def _content_digest(content: str) -> int:
+        return xxhash.xxh3_128_intdigest(content.encode('utf-8', 'surrogatepass'))
+except ImportError:
+    def _content_digest(content: str) -> bytes:
+        return hashlib.blake2b(content.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+# Tags collected from a form in one traversal: its fields, buttons and labels
+_FORM_CONTROL_TAGS = ['input', 'textarea', 'select', 'button', 'label']
+_FORM_FIELD_TAGS = ('input', 'textarea', 'select')
+_SUBMIT_TYPES = ('submit', 'button')
+
+# Form kinds in the precedence used to name a form's detected pattern
+_FORM_KINDS = ('login', 'registration', 'search', 'contact')
+
+# UI patterns recognised from element classes, and the order patterns are reported in
+_UI_CLASS_PATTERNS = (
+    ('modal_dialogs', re.compile(r'modal|dialog|popup', re.I)),
+    ('tabbed_interface', re.compile(r'tab', re.I)),
+    ('accordion', re.compile(r'accordion|collapse', re.I)),
+    ('carousel', re.compile(r'carousel|slider|swiper', re.I)),
+    ('infinite_scroll', re.compile(r'infinite-scroll', re.I)),
+    ('ajax_interactions', re.compile(r'ajax', re.I))
+)
+_UI_PATTERN_ORDER = (
+    'modal_dialogs', 'tabbed_interface', 'accordion', 'carousel',
+    'data_table', 'infinite_scroll', 'ajax_interactions'
+)
+
+_NAV_CONTAINER_TAGS = ('nav', 'header', 'footer')
+_NAV_CLASS_RE = re.compile(r'nav|menu', re.I)
+_INTERACTIVE_ROLES = ('button', 'tab', 'menuitem', 'switch')
+
+
+def _class_matches(tag: Tag, pattern: re.Pattern) -> bool:
+    """Whether a tag's class attribute matches pattern, like find_all(class_=pattern)."""
+    classes = tag.get('class')
+    if not classes:
+        return False
+    if isinstance(classes, str):
+        return pattern.search(classes) is not None
+    return any(pattern.search(c) for c in classes) or pattern.search(' '.join(classes)) is not None
+
+
+# Analysis results are built once and never modified, so they are frozen; slots
+# need Python 3.10+ and older interpreters fall back to __dict__
+_DATACLASS_OPTIONS: Dict[str, bool] = (
+    {"frozen": True, "slots": True} if sys.version_info >= (3, 10) else {"frozen": True}
+)
+
+# Maximum number of analyzed pages remembered by each PatternAnalyzer
+ANALYSIS_CACHE_SIZE = 256
+
+
+# Pattern detection rules, compiled once at import and shared by all analyzers
+_FORM_PATTERNS = {
+    'login': (
+        re.compile(r'(login|signin|sign[\s-]?in)', re.I),
+        re.compile(r'(username|email|user[\s-]?name)', re.I),
+        re.compile(r'password', re.I)
+    ),
+    'registration': (
+        re.compile(r'(register|signup|sign[\s-]?up|create[\s-]?account)', re.I),
+        re.compile(r'(confirm|repeat)[\s-]?password', re.I)
+    ),
+    'search': (
+        re.compile(r'search', re.I),
+        re.compile(r'query|q\b', re.I)
+    ),
+    'contact': (
+        re.compile(r'contact', re.I),
+        re.compile(r'message|comment', re.I),
+        re.compile(r'(your[\s-]?name|full[\s-]?name)', re.I)
+    ),
+    'checkout': (
+        re.compile(r'(checkout|payment|billing)', re.I),
+        re.compile(r'(card[\s-]?number|credit[\s-]?card)', re.I)
+    )
+}
+
+_NAVIGATION_PATTERNS = {
+    'header': ('header', 'nav', 'navigation', 'menu', 'navbar'),
+    'footer': ('footer', 'site-footer', 'page-footer'),
+    'sidebar': ('sidebar', 'aside', 'side-nav')
+}
+
+_INTERACTIVE_PATTERNS = {
+    'modal_triggers': (
+        re.compile(r'(open|show|toggle)[\s-]?(modal|dialog|popup)', re.I),
+        re.compile(r'data-toggle="modal"', re.I)
+    ),
+    'tab_controls': (
+        re.compile(r'tab|nav-tab', re.I),
+        re.compile(r'role="tab"', re.I)
+    ),
+    'accordion': (
+        re.compile(r'accordion|collapse', re.I),
+        re.compile(r'data-toggle="collapse"', re.I)
+    )
+}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class FormField:
     """Represents a form field."""
     name: str
@@ -19,23 +133,39 @@ class FormField:
     required: bool
     placeholder: Optional[str] = None
     value: Optional[str] = None
-    options: Optional[List[str]] = None
+    options: Optional[Sequence[str]] = None
     validation_pattern: Optional[str] = None
     autocomplete: Optional[str] = None
+    
+    def __post_init__(self):
+        if self.options is not None:
+            object.__setattr__(self, 'options', tuple(self.options))
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Form:
     """Represents a form on the page."""
     form_id: Optional[str]
     name: Optional[str]
     action: str
     method: str
-    fields: List[FormField]
+    fields: Sequence[FormField]
     submit_button_text: Optional[str] = None
+    # Name -> field lookup derived from fields; the first field wins on duplicates
+    fields_by_name: Mapping[str, FormField] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        fields = tuple(self.fields)
+        fields_by_name: Dict[str, FormField] = {}
+        for form_field in fields:
+            fields_by_name.setdefault(form_field.name, form_field)
+        # Frozen dataclass: normalized and derived attributes are set through
+        # object.__setattr__
+        object.__setattr__(self, 'fields', fields)
+        object.__setattr__(self, 'fields_by_name', fields_by_name)
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class NavigationElement:
     """Represents a navigation element."""
     text: str
@@ -46,7 +176,7 @@ class NavigationElement:
     aria_label: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class InteractiveElement:
     """Represents an interactive element."""
     element_type: str
@@ -54,22 +184,36 @@ class InteractiveElement:
     text: Optional[str]
     aria_label: Optional[str]
     role: Optional[str]
-    attributes: Dict[str, str]
+    attributes: Mapping[str, str]
+    
+    def __post_init__(self):
+        # Copied so later changes to the caller's dict don't leak in
+        object.__setattr__(self, 'attributes', dict(self.attributes))
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class PageStructure:
-    """Represents the analyzed page structure."""
+    """Represents the analyzed page structure.
+    
+    PatternAnalyzer hands the same instance to every caller that analyzes
+    identical content, so the dataclasses are frozen and their sequences are
+    stored as tuples. Mappings stay plain dicts so results remain picklable and
+    work with dataclasses.asdict and copy.deepcopy; treat them as read-only.
+    """
     title: str
     url: str
-    forms: List[Form]
-    navigation: List[NavigationElement]
-    interactive_elements: List[InteractiveElement]
+    forms: Sequence[Form]
+    navigation: Sequence[NavigationElement]
+    interactive_elements: Sequence[InteractiveElement]
     main_content_area: Optional[str]
     has_login_form: bool
     has_search: bool
     has_pagination: bool
-    detected_patterns: List[str]
+    detected_patterns: Sequence[str]
+    
+    def __post_init__(self):
+        for name in ('forms', 'navigation', 'interactive_elements', 'detected_patterns'):
+            object.__setattr__(self, name, tuple(getattr(self, name)))
 
 
 class PatternAnalyzer:
@@ -77,55 +221,18 @@ class PatternAnalyzer:
     
     def __init__(self):
         self.logger = logger
+        # Selector memo for the soup currently being analyzed; keyed on element
+        # identity, so it only exists while analyze_page holds the tree alive
+        self._selector_cache: Optional[Dict[Tuple, Any]] = None
+        # Recently analyzed pages keyed by (content digest, url), least recent first
+        self._analysis_cache: "OrderedDict[Tuple[Any, str], PageStructure]" = OrderedDict()
         self._init_patterns()
     
     def _init_patterns(self):
         """Initialize pattern detection rules."""
-        self.form_patterns = {
-            'login': [
-                re.compile(r'(login|signin|sign[\s-]?in)', re.I),
-                re.compile(r'(username|email|user[\s-]?name)', re.I),
-                re.compile(r'password', re.I)
-            ],
-            'registration': [
-                re.compile(r'(register|signup|sign[\s-]?up|create[\s-]?account)', re.I),
-                re.compile(r'(confirm|repeat)[\s-]?password', re.I)
-            ],
-            'search': [
-                re.compile(r'search', re.I),
-                re.compile(r'query|q\b', re.I)
-            ],
-            'contact': [
-                re.compile(r'contact', re.I),
-                re.compile(r'message|comment', re.I),
-                re.compile(r'(your[\s-]?name|full[\s-]?name)', re.I)
-            ],
-            'checkout': [
-                re.compile(r'(checkout|payment|billing)', re.I),
-                re.compile(r'(card[\s-]?number|credit[\s-]?card)', re.I)
-            ]
-        }
-        
-        self.navigation_patterns = {
-            'header': ['header', 'nav', 'navigation', 'menu', 'navbar'],
-            'footer': ['footer', 'site-footer', 'page-footer'],
-            'sidebar': ['sidebar', 'aside', 'side-nav']
-        }
-        
-        self.interactive_patterns = {
-            'modal_triggers': [
-                re.compile(r'(open|show|toggle)[\s-]?(modal|dialog|popup)', re.I),
-                re.compile(r'data-toggle="modal"', re.I)
-            ],
-            'tab_controls': [
-                re.compile(r'tab|nav-tab', re.I),
-                re.compile(r'role="tab"', re.I)
-            ],
-            'accordion': [
-                re.compile(r'accordion|collapse', re.I),
-                re.compile(r'data-toggle="collapse"', re.I)
-            ]
-        }
+        self.form_patterns = _FORM_PATTERNS
+        self.navigation_patterns = _NAVIGATION_PATTERNS
+        self.interactive_patterns = _INTERACTIVE_PATTERNS
     
     async def initialize(self):
         """Initialize the pattern analyzer."""
@@ -144,43 +251,61 @@ class PatternAnalyzer:
     
     async def analyze_page(self, page_content: str, url: str) -> PageStructure:
         """Analyze page structure and identify patterns."""
-        soup = BeautifulSoup(page_content, 'html.parser')
-        
-        # Extract basic info
-        title = self._extract_title(soup)
-        
-        # Analyze forms
-        forms = self._analyze_forms(soup)
-        
-        # Analyze navigation
-        navigation = self._analyze_navigation(soup, url)
-        
-        # Find interactive elements
-        interactive_elements = self._find_interactive_elements(soup)
-        
-        # Identify main content area
-        main_content = self._find_main_content_area(soup)
-        
-        # Detect patterns
-        detected_patterns = self._detect_patterns(soup, forms, navigation)
-        
-        # Check for specific features
-        has_login = any(self._is_login_form(form) for form in forms)
-        has_search = any(self._is_search_form(form) for form in forms)
-        has_pagination = self._has_pagination(soup)
-        
-        return PageStructure(
-            title=title,
-            url=url,
-            forms=forms,
-            navigation=navigation,
-            interactive_elements=interactive_elements,
-            main_content_area=main_content,
-            has_login_form=has_login,
-            has_search=has_search,
-            has_pagination=has_pagination,
-            detected_patterns=detected_patterns
-        )
+        cache_key = (_content_digest(page_content), url)
+        cached = self._analysis_cache.get(cache_key)
+        if cached is not None:
+            self._analysis_cache.move_to_end(cache_key)
+            return cached
+        
+        soup = BeautifulSoup(page_content, HTML_PARSER)
+        
+        self._selector_cache = {}
+        try:
+            # Extract basic info
+            title = self._extract_title(soup)
+            
+            # Analyze forms
+            forms = self._analyze_forms(soup)
+            
+            # Analyze navigation
+            navigation = self._analyze_navigation(soup, url)
+            
+            # Find interactive elements
+            interactive_elements = self._find_interactive_elements(soup)
+            
+            # Identify main content area
+            main_content = self._find_main_content_area(soup)
+            
+            # Classify each form once for pattern detection and feature checks
+            form_kinds = [self._classify_form(form) for form in forms]
+            
+            # Detect patterns
+            detected_patterns = self._detect_patterns(soup, forms, navigation, form_kinds)
+            
+            # Check for specific features
+            has_login = any('login' in kinds for kinds in form_kinds)
+            has_search = any('search' in kinds for kinds in form_kinds)
+            has_pagination = self._has_pagination(soup)
+            
+            structure = PageStructure(
+                title=title,
+                url=url,
+                forms=forms,
+                navigation=navigation,
+                interactive_elements=interactive_elements,
+                main_content_area=main_content,
+                has_login_form=has_login,
+                has_search=has_search,
+                has_pagination=has_pagination,
+                detected_patterns=detected_patterns
+            )
+        finally:
+            self._selector_cache = None
+        
+        self._analysis_cache[cache_key] = structure
+        if len(self._analysis_cache) > ANALYSIS_CACHE_SIZE:
+            self._analysis_cache.popitem(last=False)
+        return structure
     
     def _extract_title(self, soup: BeautifulSoup) -> str:
         """Extract page title."""
@@ -205,11 +330,18 @@ class PatternAnalyzer:
             action = form_tag.get('action', '')
             method = form_tag.get('method', 'get').lower()
             
+            # Collect fields, buttons and labels in a single walk of the form
+            controls = form_tag.find_all(_FORM_CONTROL_TAGS)
+            
             # Analyze form fields
-            fields = self._analyze_form_fields(form_tag)
+            fields = self._analyze_form_fields(form_tag, controls)
             
             # Find submit button
-            submit_button = form_tag.find(['button', 'input'], {'type': ['submit', 'button']})
+            submit_button = next(
+                (c for c in controls
+                 if c.name in ('button', 'input') and c.get('type') in _SUBMIT_TYPES),
+                None
+            )
             submit_text = None
             if submit_button:
                 if submit_button.name == 'button':
@@ -228,12 +360,27 @@ class PatternAnalyzer:
         
         return forms
     
-    def _analyze_form_fields(self, form_tag: Tag) -> List[FormField]:
-        """Analyze fields within a form."""
+    def _analyze_form_fields(self, form_tag: Tag,
+                             controls: Optional[List[Tag]] = None) -> List[FormField]:
+        """Analyze fields within a form.
+        
+        ``controls`` is the form's input/textarea/select/button/label tags in
+        document order; it is collected here when not supplied.
+        """
         fields = []
+        if controls is None:
+            controls = form_tag.find_all(_FORM_CONTROL_TAGS)
+        
+        # Index labels by their 'for' target, keeping the first like find() would
+        labels: Dict[str, Tag] = {}
+        for tag in controls:
+            if tag.name == 'label' and tag.get('for'):
+                labels.setdefault(tag['for'], tag)
         
         # Find all input fields
-        for input_tag in form_tag.find_all(['input', 'textarea', 'select']):
+        for input_tag in controls:
+            if input_tag.name not in _FORM_FIELD_TAGS:
+                continue
             field_type = input_tag.get('type', 'text')
             
             # Skip submit/button types
@@ -244,7 +391,7 @@ class PatternAnalyzer:
             field_id = input_tag.get('id', '')
             
             # Find associated label
-            label = self._find_field_label(form_tag, input_tag, field_id)
+            label = self._find_field_label(form_tag, input_tag, field_id, labels)
             
             # Extract field properties
             required = input_tag.has_attr('required')
@@ -276,11 +423,15 @@ class PatternAnalyzer:
         
         return fields
     
-    def _find_field_label(self, form_tag: Tag, field_tag: Tag, field_id: str) -> str:
+    def _find_field_label(self, form_tag: Tag, field_tag: Tag, field_id: str,
+                          labels: Optional[Dict[str, Tag]] = None) -> str:
         """Find label for a form field."""
         # Method 1: Label with 'for' attribute
         if field_id:
-            label = form_tag.find('label', {'for': field_id})
+            if labels is not None:
+                label = labels.get(field_id)
+            else:
+                label = form_tag.find('label', {'for': field_id})
             if label:
                 return label.get_text(strip=True)
         
@@ -314,9 +465,14 @@ class PatternAnalyzer:
         navigation = []
         seen_hrefs = set()
         
-        # Find navigation containers
-        nav_containers = soup.find_all(['nav', 'header', 'footer'])
-        nav_containers.extend(soup.find_all(class_=re.compile(r'nav|menu', re.I)))
+        # One walk finds semantic containers and nav/menu classed elements;
+        # containers keep their original order: semantic tags, then classed
+        candidates = soup.find_all(
+            lambda tag: tag.name in _NAV_CONTAINER_TAGS or _class_matches(tag, _NAV_CLASS_RE)
+        )
+        classed = [tag for tag in candidates if _class_matches(tag, _NAV_CLASS_RE)]
+        nav_containers = [tag for tag in candidates if tag.name in _NAV_CONTAINER_TAGS]
+        nav_containers.extend(classed)
         
         for container in nav_containers:
             # Find links within navigation
@@ -345,7 +501,7 @@ class PatternAnalyzer:
                 ))
         
         # Find navigation buttons
-        for button in soup.find_all('button', class_=re.compile(r'nav|menu', re.I)):
+        for button in (tag for tag in classed if tag.name == 'button'):
             if not button.get_text(strip=True):
                 continue
             
@@ -373,8 +529,23 @@ class PatternAnalyzer:
         elements = []
         seen_selectors = set()
         
+        # Gather every candidate in a single walk, grouped by kind
+        buttons, input_buttons, clickable_links, role_elements = [], [], [], []
+        for tag in soup.find_all(True):
+            if tag.name == 'button':
+                buttons.append(tag)
+            elif tag.name == 'input':
+                if tag.get('type') in _SUBMIT_TYPES:
+                    input_buttons.append(tag)
+            elif tag.name == 'a':
+                if tag.has_attr('onclick'):
+                    clickable_links.append(tag)
+            # Buttons, links and inputs with a role are handled above or skipped
+            elif tag.get('role') in _INTERACTIVE_ROLES:
+                role_elements.append(tag)
+        
         # Buttons
-        buttons = soup.find_all('button') + soup.find_all('input', type=['button', 'submit'])
+        buttons.extend(input_buttons)
         for button in buttons:
             selector = self._generate_selector(button)
             if selector in seen_selectors:
@@ -391,7 +562,7 @@ class PatternAnalyzer:
             ))
         
         # Links with onclick or data attributes
-        for link in soup.find_all('a', attrs={'onclick': True}):
+        for link in clickable_links:
             selector = self._generate_selector(link)
             if selector in seen_selectors:
                 continue
@@ -407,10 +578,7 @@ class PatternAnalyzer:
             ))
         
         # Elements with interactive roles
-        for elem in soup.find_all(attrs={'role': ['button', 'tab', 'menuitem', 'switch']}):
-            if elem.name in ['button', 'a', 'input']:  # Already processed
-                continue
-            
+        for elem in role_elements:
             selector = self._generate_selector(elem)
             if selector in seen_selectors:
                 continue
@@ -429,6 +597,17 @@ class PatternAnalyzer:
     
     def _generate_selector(self, element: Tag) -> str:
         """Generate a CSS selector for an element."""
+        cache = self._selector_cache
+        if cache is None:
+            return self._build_selector(element)
+        
+        key = ('selector', id(element))
+        if key not in cache:
+            cache[key] = self._build_selector(element)
+        return cache[key]
+    
+    def _build_selector(self, element: Tag) -> str:
+        """Build a CSS selector for an element."""
         # Prefer ID
         if element.get('id'):
             return f"#{element['id']}"
@@ -438,14 +617,14 @@ class PatternAnalyzer:
         if classes:
             class_selector = '.' + '.'.join(classes)
             # Check if unique
-            if len(element.parent.select(class_selector)) == 1:
+            if self._count_matches(element.parent, class_selector) == 1:
                 return class_selector
         
         # Use data attributes
         for attr, value in element.attrs.items():
             if attr.startswith('data-') and value:
                 selector = f"{element.name}[{attr}='{value}']"
-                if len(element.parent.select(selector)) == 1:
+                if self._count_matches(element.parent, selector) == 1:
                     return selector
         
         # Use text content for buttons/links
@@ -455,10 +634,33 @@ class PatternAnalyzer:
                 return f"{element.name}:contains('{text[:20]}')"
         
         # Fallback to tag name with index
-        siblings = element.parent.find_all(element.name)
-        index = siblings.index(element)
+        index = self._sibling_index(element)
         return f"{element.name}:nth-of-type({index + 1})"
     
+    def _count_matches(self, scope: Tag, selector: str) -> int:
+        """Count matches of a selector within scope, memoized per parse."""
+        cache = self._selector_cache
+        if cache is None:
+            return len(scope.select(selector))
+        
+        key = ('count', id(scope), selector)
+        if key not in cache:
+            cache[key] = len(scope.select(selector))
+        return cache[key]
+    
+    def _sibling_index(self, element: Tag) -> int:
+        """Index of element among same-named tags under its parent."""
+        parent = element.parent
+        cache = self._selector_cache
+        if cache is None:
+            return parent.find_all(element.name).index(element)
+        
+        # Index every same-named tag under the parent once, so siblings reuse it
+        key = ('siblings', id(parent), element.name)
+        if key not in cache:
+            cache[key] = {id(tag): i for i, tag in enumerate(parent.find_all(element.name))}
+        return cache[key][id(element)]
+    
     def _find_main_content_area(self, soup: BeautifulSoup) -> Optional[str]:
         """Identify the main content area of the page."""
         # Check for semantic HTML5 tags
@@ -487,127 +689,121 @@ class PatternAnalyzer:
         return None
     
     def _detect_patterns(self, soup: BeautifulSoup, forms: List[Form], 
-                        navigation: List[NavigationElement]) -> List[str]:
+                        navigation: List[NavigationElement],
+                        form_kinds: Optional[List[FrozenSet[str]]] = None) -> List[str]:
         """Detect common UI patterns."""
         patterns = []
+        if form_kinds is None:
+            form_kinds = [self._classify_form(form) for form in forms]
         
         # Check form patterns
-        for form in forms:
-            if self._is_login_form(form):
-                patterns.append('login_form')
-            elif self._is_registration_form(form):
-                patterns.append('registration_form')
-            elif self._is_search_form(form):
-                patterns.append('search_form')
-            elif self._is_contact_form(form):
-                patterns.append('contact_form')
-        
-        # Check for modals
-        if soup.find_all(class_=re.compile(r'modal|dialog|popup', re.I)):
-            patterns.append('modal_dialogs')
-        
-        # Check for tabs
-        if soup.find_all(role='tab') or soup.find_all(class_=re.compile(r'tab', re.I)):
-            patterns.append('tabbed_interface')
-        
-        # Check for accordions
-        if soup.find_all(class_=re.compile(r'accordion|collapse', re.I)):
-            patterns.append('accordion')
-        
-        # Check for carousel/slider
-        if soup.find_all(class_=re.compile(r'carousel|slider|swiper', re.I)):
-            patterns.append('carousel')
-        
-        # Check for data tables
-        tables = soup.find_all('table')
-        if any(table.find('thead') for table in tables):
-            patterns.append('data_table')
-        
-        # Check for infinite scroll indicators
-        if soup.find_all(attrs={'data-infinite-scroll': True}) or \
-           soup.find_all(class_=re.compile(r'infinite-scroll', re.I)):
-            patterns.append('infinite_scroll')
-        
-        # Check for AJAX indicators
-        if soup.find_all(attrs=lambda x: x and 'ajax' in str(x).lower()):
-            patterns.append('ajax_interactions')
+        for kinds in form_kinds:
+            kind = next((k for k in _FORM_KINDS if k in kinds), None)
+            if kind:
+                patterns.append(f'{kind}_form')
+        
+        # Check for UI component patterns in a single walk of the page
+        found = self._scan_ui_patterns(soup)
+        patterns.extend(name for name in _UI_PATTERN_ORDER if name in found)
         
         return patterns
     
-    def _is_login_form(self, form: Form) -> bool:
-        """Check if a form is a login form."""
-        login_indicators = 0
+    def _scan_ui_patterns(self, soup: BeautifulSoup) -> Set[str]:
+        """Find modal, tab, accordion, carousel, table, scroll and AJAX markers."""
+        found: Set[str] = set()
         
-        # Check form attributes
-        form_text = f"{form.action} {form.name or ''} {form.form_id or ''}"
-        for pattern in self.form_patterns['login']:
-            if pattern.search(form_text):
-                login_indicators += 1
+        for tag in soup.descendants:
+            if not isinstance(tag, Tag):
+                continue
+            
+            if tag.get('class'):
+                for name, pattern in _UI_CLASS_PATTERNS:
+                    if name not in found and _class_matches(tag, pattern):
+                        found.add(name)
+            
+            if tag.get('role') == 'tab':
+                found.add('tabbed_interface')
+            if tag.has_attr('data-infinite-scroll'):
+                found.add('infinite_scroll')
+            # A table with a header row
+            if tag.name == 'thead' and tag.find_parent('table') is not None:
+                found.add('data_table')
+            
+            if len(found) == len(_UI_PATTERN_ORDER):
+                break
         
-        # Check fields
-        has_username = False
-        has_password = False
+        return found
+    
+    def _classify_form(self, form: Form) -> FrozenSet[str]:
+        """Classify a form against every known kind in one pass over its fields."""
+        patterns = self.form_patterns
+        username_pattern = patterns['login'][1]
+        
+        password_count = 0
+        has_username = has_email = has_name = has_message = False
+        text_fields = []
         
-        for field in form.fields:
-            field_text = f"{field.name} {field.label}"
+        for form_field in form.fields:
+            name = form_field.name.lower()
             
-            if field.field_type == 'password':
-                has_password = True
-            elif field.field_type in ['text', 'email']:
-                if any(p.search(field_text) for p in self.form_patterns['login'][1:2]):
+            if form_field.field_type == 'password':
+                password_count += 1
+            elif form_field.field_type in ('text', 'email'):
+                if username_pattern.search(f"{form_field.name} {form_field.label}"):
                     has_username = True
+            
+            if form_field.field_type in ('text', 'search'):
+                text_fields.append(form_field)
+            if form_field.field_type == 'email' or 'email' in name:
+                has_email = True
+            if 'name' in name or 'name' in form_field.label.lower():
+                has_name = True
+            if form_field.field_type == 'textarea' or 'message' in name:
+                has_message = True
         
-        return has_username and has_password
+        form_text = f"{form.action} {form.name or ''} {form.form_id or ''}"
+        labelled_text = f"{form_text} {form.submit_button_text or ''}"
+        kinds = set()
+        
+        # Login: a username-like field alongside a password
+        if has_username and password_count:
+            kinds.add('login')
+        
+        # Registration: keyword, or password confirmation plus an email field
+        if patterns['registration'][0].search(labelled_text) or (password_count >= 2 and has_email):
+            kinds.add('registration')
+        
+        # Search: form attributes, or a single text field that looks like a query
+        if any(p.search(form_text) for p in patterns['search']):
+            kinds.add('search')
+        elif len(text_fields) == 1:
+            form_field = text_fields[0]
+            field_text = f"{form_field.name} {form_field.label} {form_field.placeholder or ''}"
+            if any(p.search(field_text) for p in patterns['search']):
+                kinds.add('search')
+        
+        # Contact: several contact keywords, or name, email and message fields
+        indicators = sum(1 for p in patterns['contact'] if p.search(labelled_text))
+        if indicators >= 2 or (has_name and has_email and has_message):
+            kinds.add('contact')
+        
+        return frozenset(kinds)
+    
+    def _is_login_form(self, form: Form) -> bool:
+        """Check if a form is a login form."""
+        return 'login' in self._classify_form(form)
     
     def _is_registration_form(self, form: Form) -> bool:
         """Check if a form is a registration form."""
-        # Check for registration keywords
-        form_text = f"{form.action} {form.name or ''} {form.form_id or ''} {form.submit_button_text or ''}"
-        has_registration_keyword = any(p.search(form_text) for p in self.form_patterns['registration'][:1])
-        
-        # Check for password confirmation field
-        password_fields = [f for f in form.fields if f.field_type == 'password']
-        has_password_confirm = len(password_fields) >= 2
-        
-        # Check for email field
-        has_email = any(f.field_type == 'email' or 'email' in f.name.lower() for f in form.fields)
-        
-        return has_registration_keyword or (has_password_confirm and has_email)
+        return 'registration' in self._classify_form(form)
     
     def _is_search_form(self, form: Form) -> bool:
         """Check if a form is a search form."""
-        # Check form attributes
-        form_text = f"{form.action} {form.name or ''} {form.form_id or ''}"
-        for pattern in self.form_patterns['search']:
-            if pattern.search(form_text):
-                return True
-        
-        # Check if has single text field
-        text_fields = [f for f in form.fields if f.field_type in ['text', 'search']]
-        if len(text_fields) == 1:
-            field = text_fields[0]
-            field_text = f"{field.name} {field.label} {field.placeholder or ''}"
-            if any(p.search(field_text) for p in self.form_patterns['search']):
-                return True
-        
-        return False
+        return 'search' in self._classify_form(form)
     
     def _is_contact_form(self, form: Form) -> bool:
         """Check if a form is a contact form."""
-        indicators = 0
-        
-        # Check form text
-        form_text = f"{form.action} {form.name or ''} {form.form_id or ''} {form.submit_button_text or ''}"
-        for pattern in self.form_patterns['contact']:
-            if pattern.search(form_text):
-                indicators += 1
-        
-        # Check for typical contact form fields
-        has_name = any('name' in f.name.lower() or 'name' in f.label.lower() for f in form.fields)
-        has_email = any(f.field_type == 'email' or 'email' in f.name.lower() for f in form.fields)
-        has_message = any(f.field_type == 'textarea' or 'message' in f.name.lower() for f in form.fields)
-        
-        return indicators >= 2 or (has_name and has_email and has_message)
+        return 'contact' in self._classify_form(form)
     
     def _has_pagination(self, soup: BeautifulSoup) -> bool:
         """Check if page has pagination."""
@@ -640,7 +836,8 @@ class PatternAnalyzer:
         
         # Form-based scenarios
         for form in page_structure.forms:
-            if self._is_login_form(form):
+            kinds = self._classify_form(form)
+            if 'login' in kinds:
                 scenarios.append({
                     'name': 'Login Flow',
                     'category': 'authentication',
@@ -664,7 +861,7 @@ class PatternAnalyzer:
                     ]
                 })
             
-            elif self._is_registration_form(form):
+            elif 'registration' in kinds:
                 scenarios.append({
                     'name': 'User Registration',
                     'category': 'authentication',
@@ -677,7 +874,7 @@ class PatternAnalyzer:
                     ]
                 })
             
-            elif self._is_search_form(form):
+            elif 'search' in kinds:
                 scenarios.append({
                     'name': 'Search Functionality',
                     'category': 'search',
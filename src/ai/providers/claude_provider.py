@@ -6,18 +6,29 @@ Uses Anthropic's Claude API for test generation
 import os
 import json
 import asyncio
+import importlib.util
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
-try:
-    import anthropic
-    from anthropic import AsyncAnthropic
-except ImportError:
+# Only check that the SDK is installed here; importing it takes around a
+# second, so that is deferred until the first provider is created
+if importlib.util.find_spec('anthropic') is None:
     raise ImportError(
         "anthropic package is not installed. "
         "Please install it with: pip install anthropic"
     )
 
+# Client class, resolved by _client_class on first use
+AsyncAnthropic = None
+
+
+def _client_class():
+    """Return the Anthropic client class, importing the SDK on first call"""
+    global AsyncAnthropic
+    if AsyncAnthropic is None:
+        from anthropic import AsyncAnthropic
+    return AsyncAnthropic
+
 from .base_provider import (
     BaseAIProvider, PageAnalysis, TestGenerationRequest,
     GeneratedTest, TestType, PageElement
@@ -39,7 +50,7 @@ class ClaudeProvider(BaseAIProvider):
             raise ValueError("Claude API key not found in environment variables")
         
         # Initialize Claude client
-        self.client = AsyncAnthropic(api_key=api_key)
+        self.client = _client_class()(api_key=api_key)
         self.model = self.config.get('models', {}).get('default', 'claude-3-opus-20240229')
         
     async def analyze_page(self, page_content: str, url: str) -> PageAnalysis:
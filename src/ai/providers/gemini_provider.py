@@ -6,17 +6,29 @@ Uses Google's Gemini API for test generation
 import os
 import json
 import asyncio
+import importlib.util
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
-try:
-    import google.generativeai as genai
-except ImportError:
+# Only check that the SDK is installed here; importing it takes close to a
+# second, so that is deferred until the first provider is created
+if importlib.util.find_spec('google.generativeai') is None:
     raise ImportError(
         "google-generativeai package is not installed. "
         "Please install it with: pip install google-generativeai"
     )
 
+# SDK module, resolved by _sdk on first use
+genai = None
+
+
+def _sdk():
+    """Return the google.generativeai module, importing it on first call"""
+    global genai
+    if genai is None:
+        import google.generativeai as genai
+    return genai
+
 from .base_provider import (
     BaseAIProvider, PageAnalysis, TestGenerationRequest,
     GeneratedTest, TestType, PageElement
@@ -38,6 +50,7 @@ class GeminiProvider(BaseAIProvider):
             raise ValueError("Gemini API key not found in environment variables")
         
         # Configure Gemini
+        genai = _sdk()
         genai.configure(api_key=api_key)
         
         # Initialize the model
@@ -4,20 +4,41 @@ Uses OpenAI's GPT API for test generation
 """
 
 import os
+import re
 import json
 import asyncio
+import importlib.util
+import weakref
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
-try:
-    import openai
-    from openai import AsyncOpenAI
-except ImportError:
+# Only check that the SDK is installed here; importing it takes around half a
+# second, so that is deferred until the first provider is created
+if importlib.util.find_spec('openai') is None:
     raise ImportError(
         "openai package is not installed. "
         "Please install it with: pip install openai"
     )
 
+# Client class, resolved by _client_class on first use
+AsyncOpenAI = None
+
+
+def _client_class():
+    """Return the OpenAI client class, importing the SDK on first call"""
+    global AsyncOpenAI
+    if AsyncOpenAI is None:
+        from openai import AsyncOpenAI
+    return AsyncOpenAI
+
+
+# orjson parses GPT JSON responses considerably faster when available
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 from .base_provider import (
     BaseAIProvider, PageAnalysis, TestGenerationRequest,
     GeneratedTest, TestType, PageElement
@@ -25,6 +46,58 @@ from .base_provider import (
 from utils.logger import setup_logger
 
 
+# Markdown code fences, optionally labelled ("```python # test")
+_LABELED_CODE_BLOCK_RE = re.compile(r'```(?:python|py)?\s*(?:#\s*)?(\w+)?\n(.*?)```', re.DOTALL)
+_PYTHON_CODE_BLOCK_RE = re.compile(r'```(?:python|py)\n(.*?)```', re.DOTALL)
+
+# Fixed prompts for test validation
+_VALIDATION_SYSTEM_PROMPT = "You are a Python and Playwright expert. Validate the test code and return JSON."
+_VALIDATION_PROMPT = """Please validate this Playwright test code and identify any issues.
+        
+Check for:
+1. Syntax errors
+2. Missing imports
+3. Incorrect Playwright API usage
+4. Missing async/await
+5. Test structure issues
+
+Return a JSON response with the following structure:
+{{"is_valid": boolean, "issues": ["list of issues found"], "suggestions": ["list of improvement suggestions"]}}
+
+Test code:
+```python
+{code}
+```"""
+
+# AsyncOpenAI clients keyed by event loop and API key, shared so that providers
+# reuse the underlying HTTP connection pool instead of opening a new one per
+# instance. An httpx pool is bound to the loop it was opened on, so clients are
+# never shared across loops and are dropped along with their loop.
+_CLIENT_CACHE: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_client(api_key: str) -> Any:
+    """Return the shared OpenAI client for an API key on the running event loop"""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # No loop to bind a pool to yet; the client opens its pool on first use
+        return _client_class()(api_key=api_key)
+    
+    clients = _CLIENT_CACHE.setdefault(loop, {})
+    client = clients.get(api_key)
+    if client is None:
+        client = clients[api_key] = _client_class()(api_key=api_key)
+    return client
+
+
+def clear_client_cache() -> None:
+    """Forget all shared OpenAI clients so the next provider builds a new one"""
+    _CLIENT_CACHE.clear()
+
+
 class GPTProvider(BaseAIProvider):
     """GPT AI provider for test generation"""
     
@@ -38,16 +111,21 @@ class GPTProvider(BaseAIProvider):
         if not api_key:
             raise ValueError("OpenAI API key not found in environment variables")
         
-        # Initialize OpenAI client
-        self.client = AsyncOpenAI(api_key=api_key)
+        # Initialize OpenAI client (shared across providers with the same key)
+        self.client = _get_client(api_key)
         self.model = self.config.get('models', {}).get('default', 'gpt-4-turbo-preview')
         
+        # Request parameters and prompts don't change per call; resolve them once
+        request_params = self.config.get('request_params', {})
+        self.temperature = request_params.get('temperature', 0.2)
+        self.max_tokens = request_params.get('max_tokens', 4096)
+        self.system_prompt = self.prompts.get('system_prompt', '')
+        
     async def analyze_page(self, page_content: str, url: str) -> PageAnalysis:
         """Use GPT to analyze a web page"""
         self.logger.info(f"Analyzing page: {url}")
         
         # Prepare the prompt
-        system_prompt = self.prompts.get('system_prompt', '')
         analysis_prompt = self.prompts.get('page_analysis', '')
         
         try:
@@ -55,17 +133,17 @@ class GPTProvider(BaseAIProvider):
             response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": self.system_prompt},
                     {"role": "user", "content": f"{analysis_prompt}\n\nURL: {url}\n\nPage Content:\n{page_content[:8000]}"}
                 ],
-                temperature=self.config.get('request_params', {}).get('temperature', 0.2),
-                max_tokens=self.config.get('request_params', {}).get('max_tokens', 4096),
+                temperature=self.temperature,
+                max_tokens=self.max_tokens,
                 response_format={"type": "json_object"}
             )
             
             # Parse the response
             response_text = response.choices[0].message.content
-            analysis_data = json.loads(response_text)
+            analysis_data = _json_loads(response_text)
             
             # Convert to PageAnalysis object
             elements = [
@@ -100,12 +178,38 @@ class GPTProvider(BaseAIProvider):
                 test_scenarios=[]
             )
     
+    async def analyze_pages(
+        self,
+        pages: List[Tuple[str, str]],
+        concurrency: Optional[int] = None
+    ) -> List[PageAnalysis]:
+        """Analyze several pages concurrently, bounded to respect rate limits
+        
+        Args:
+            pages: (page_content, url) pairs to analyze
+            concurrency: Maximum simultaneous requests; defaults to the
+                configured rate_limits.concurrent_requests
+        
+        Returns:
+            Page analyses in the same order as the input pages
+        """
+        if concurrency is None:
+            concurrency = self.config.get('rate_limits', {}).get('concurrent_requests', 8)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def analyze_one(page_content: str, url: str) -> PageAnalysis:
+            async with semaphore:
+                return await self.analyze_page(page_content, url)
+        
+        return await asyncio.gather(
+            *(analyze_one(page_content, url) for page_content, url in pages)
+        )
+    
     async def generate_test(self, request: TestGenerationRequest) -> GeneratedTest:
         """Generate a test using GPT"""
         self.logger.info(f"Generating {request.test_type.value} test")
         
         # Prepare the prompt
-        system_prompt = self.prompts.get('system_prompt', '')
         generation_prompt = self.prompts.get('test_generation', '')
         
         # Format the prompt
@@ -122,11 +226,11 @@ class GPTProvider(BaseAIProvider):
             response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": self.system_prompt},
                     {"role": "user", "content": formatted_prompt}
                 ],
-                temperature=self.config.get('request_params', {}).get('temperature', 0.2),
-                max_tokens=self.config.get('request_params', {}).get('max_tokens', 4096)
+                temperature=self.temperature,
+                max_tokens=self.max_tokens
             )
             
             response_text = response.choices[0].message.content
@@ -166,29 +270,12 @@ class GPTProvider(BaseAIProvider):
         """Validate generated test code using GPT"""
         self.logger.info("Validating generated test code")
         
-        validation_prompt = """Please validate this Playwright test code and identify any issues.
-        
-Check for:
-1. Syntax errors
-2. Missing imports
-3. Incorrect Playwright API usage
-4. Missing async/await
-5. Test structure issues
-
-Return a JSON response with the following structure:
-{"is_valid": boolean, "issues": ["list of issues found"], "suggestions": ["list of improvement suggestions"]}
-
-Test code:
-```python
-{code}
-```"""
-        
         try:
             response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": "You are a Python and Playwright expert. Validate the test code and return JSON."},
-                    {"role": "user", "content": validation_prompt.format(code=test_code)}
+                    {"role": "system", "content": _VALIDATION_SYSTEM_PROMPT},
+                    {"role": "user", "content": _VALIDATION_PROMPT.format(code=test_code)}
                 ],
                 temperature=0.1,
                 max_tokens=1000,
@@ -196,7 +283,7 @@ Test code:
             )
             
             content = response.choices[0].message.content
-            validation_result = json.loads(content)
+            validation_result = _json_loads(content)
             return validation_result.get('is_valid', False), validation_result.get('issues', [])
             
         except Exception as e:
@@ -208,22 +295,14 @@ Test code:
         code_blocks = {}
         
         # Look for code blocks with labels
-        import re
-        
-        # Pattern for labeled code blocks
-        pattern = r'```(?:python|py)?\s*(?:#\s*)?(\w+)?\n(.*?)```'
-        matches = re.finditer(pattern, text, re.DOTALL)
-        
-        for match in matches:
+        for match in _LABELED_CODE_BLOCK_RE.finditer(text):
             label = match.group(1) or 'python'
             code = match.group(2).strip()
             code_blocks[label.lower()] = code
         
         # If no labeled blocks, get all Python blocks
         if not code_blocks:
-            pattern = r'```(?:python|py)\n(.*?)```'
-            matches = re.finditer(pattern, text, re.DOTALL)
-            for i, match in enumerate(matches):
+            for i, match in enumerate(_PYTHON_CODE_BLOCK_RE.finditer(text)):
                 code_blocks[f'block_{i}'] = match.group(1).strip()
         
         return code_blocks
\ No newline at end of file
@@ -3,26 +3,38 @@ AI Provider Factory
 Manages the creation and selection of AI providers
 """
 
-from typing import Dict, Optional, Type
+import os
+from typing import Dict, Mapping, Optional, Type
 from enum import Enum
 
 from .base_provider import BaseAIProvider
 from utils.logger import setup_logger
 
 
-class AIProviderType(Enum):
+class AIProviderType(str, Enum):
     """Available AI provider types"""
     CLAUDE = "claude"
     GEMINI = "gemini"
     GPT = "gpt"
 
 
+# Raised when a known provider's SDK could not be imported
+_UNAVAILABLE_MESSAGES: Dict[AIProviderType, str] = {
+    AIProviderType.CLAUDE: "Claude provider not available. Install with: pip install anthropic",
+    AIProviderType.GEMINI: "Gemini provider not available. Install with: pip install google-generativeai",
+    AIProviderType.GPT: "GPT provider not available. Install with: pip install openai"
+}
+
+
 class AIProviderFactory:
     """Factory for creating AI providers"""
     
     # Registry of available providers (lazy loaded)
     _providers: Dict[AIProviderType, Type[BaseAIProvider]] = None
     
+    # Environment the API keys are read from; tests swap in a plain mapping
+    _env: Mapping[str, str] = os.environ
+    
     def __init__(self):
         """Initialize the factory"""
         self.logger = setup_logger(self.__class__.__name__)
@@ -70,19 +82,14 @@ class AIProviderFactory:
         """
         cls._load_providers()
         
-        if provider_type not in cls._providers:
+        try:
+            provider_class = cls._providers[provider_type]
+        except KeyError:
             # Try to give helpful error message
-            provider_name = provider_type.value
-            if provider_name == 'claude':
-                raise ValueError(f"Claude provider not available. Install with: pip install anthropic")
-            elif provider_name == 'gemini':
-                raise ValueError(f"Gemini provider not available. Install with: pip install google-generativeai")
-            elif provider_name == 'gpt':
-                raise ValueError(f"GPT provider not available. Install with: pip install openai")
-            else:
-                raise ValueError(f"Unknown provider type: {provider_type}")
+            raise ValueError(
+                _UNAVAILABLE_MESSAGES.get(provider_type, f"Unknown provider type: {provider_type}")
+            ) from None
         
-        provider_class = cls._providers[provider_type]
         return provider_class(config_path)
     
     @classmethod
@@ -93,18 +100,16 @@ class AIProviderFactory:
         Returns:
             Dictionary of provider names and their availability
         """
-        import os
-        
         availability = {}
         
         # Check Claude
-        availability['claude'] = bool(os.getenv('ANTHROPIC_API_KEY'))
+        availability['claude'] = bool(cls._env.get('ANTHROPIC_API_KEY'))
         
         # Check Gemini
-        availability['gemini'] = bool(os.getenv('GOOGLE_API_KEY'))
+        availability['gemini'] = bool(cls._env.get('GOOGLE_API_KEY'))
         
         # Check GPT
-        availability['gpt'] = bool(os.getenv('OPENAI_API_KEY'))
+        availability['gpt'] = bool(cls._env.get('OPENAI_API_KEY'))
         
         return availability
     
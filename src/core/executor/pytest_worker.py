@@ -0,0 +1,238 @@
+"""
+Persistent pytest worker for the AI Playwright Engine.
+
+A worker is a long-lived Python process that runs pytest in-process for each
+job it receives, so interpreter, pytest and Playwright import costs are paid
+once per worker rather than once per script.
+
+Protocol (one JSON object per line):
+    request:  {"args": ["path/to/test_script.py", "-v", ...]}
+    response: {"returncode": 0, "stdout": "...", "stderr": "..."}
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+WORKER_SCRIPT = str(Path(__file__).resolve())
+
+# Largest reply line accepted from a worker. Replies carry the full captured
+# stdout/stderr of a run, which easily exceeds asyncio's 64 KiB default.
+REPLY_LIMIT = 256 * 1024 * 1024
+
+
+def _job_dirs(args: List[str]) -> List[str]:
+    """Directories holding a job's own code: its --rootdir and test paths."""
+    dirs = []
+    for arg in args:
+        if arg.startswith('--rootdir='):
+            arg = arg[len('--rootdir='):]
+        elif arg.startswith('-'):
+            continue
+        path = Path(arg)
+        if path.is_file():
+            path = path.parent
+        if path.is_dir():
+            dirs.append(os.path.realpath(path))
+    return dirs
+
+
+def _forget_job_modules(preloaded: set, dirs: List[str]) -> None:
+    """
+    Drop the modules a job imported from its own directories.
+
+    pytest reuses a cached module whenever its import name matches, so a later
+    job with a same-named script would otherwise run the previous job's code.
+    Libraries the job pulled in stay cached for the next one.
+    """
+    new_names = set(sys.modules) - preloaded
+    stale = set()
+    for name in new_names:
+        module_file = getattr(sys.modules[name], '__file__', None)
+        if module_file and any(
+            os.path.realpath(module_file).startswith(d + os.sep) for d in dirs
+        ):
+            stale.add(name)
+    # Placeholder parent packages pytest created for those modules
+    stale.update(
+        name for name in new_names
+        if getattr(sys.modules[name], '__file__', None) is None
+        and any(s.startswith(name + '.') for s in stale)
+    )
+    for name in stale:
+        del sys.modules[name]
+
+
+def _run_job(args: List[str]) -> Dict[str, Any]:
+    """Run a single pytest invocation in this process and capture its output."""
+    import pytest
+
+    preloaded = set(sys.modules)
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            returncode = int(pytest.main(list(args)))
+        except SystemExit as e:
+            returncode = e.code if isinstance(e.code, int) else 1
+        except Exception as e:
+            print(f"Worker error: {e}", file=sys.stderr)
+            returncode = 1
+        finally:
+            _forget_job_modules(preloaded, _job_dirs(args))
+
+    return {
+        'returncode': returncode,
+        'stdout': stdout.getvalue(),
+        'stderr': stderr.getvalue()
+    }
+
+
+def main() -> None:
+    """Serve pytest jobs read from stdin until EOF."""
+    # Keep a private handle on the protocol pipe and point fd 1 at stderr so
+    # anything written straight to the file descriptor cannot corrupt replies.
+    protocol = os.fdopen(os.dup(sys.stdout.fileno()), 'w', encoding='utf-8')
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            job = json.loads(line)
+            reply = _run_job(job.get('args', []))
+        except Exception as e:
+            reply = {'returncode': 1, 'stdout': '', 'stderr': f"Worker error: {e}"}
+        protocol.write(json.dumps(reply) + '\n')
+        protocol.flush()
+
+
+class PytestWorker:
+    """Handle on a single persistent pytest worker process."""
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self.broken = False
+
+    @classmethod
+    async def start(cls) -> 'PytestWorker':
+        """Spawn a new worker process."""
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, WORKER_SCRIPT,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            limit=REPLY_LIMIT
+        )
+        return cls(process)
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None and not self.broken
+
+    async def run(self, args: List[str]) -> Dict[str, Any]:
+        """Send a job to the worker and wait for its reply."""
+        self.process.stdin.write((json.dumps({'args': args}) + '\n').encode('utf-8'))
+        await self.process.stdin.drain()
+
+        line = await self.process.stdout.readline()
+        if not line:
+            raise RuntimeError("pytest worker exited unexpectedly")
+        return json.loads(line)
+
+    async def close(self) -> None:
+        """Stop the worker process."""
+        if not self.alive:
+            return
+        try:
+            self.process.stdin.close()
+            await asyncio.wait_for(self.process.wait(), timeout=5)
+        except (asyncio.TimeoutError, Exception):
+            self.kill()
+
+    def kill(self) -> None:
+        """Forcefully terminate the worker process."""
+        self.broken = True
+        if self.process.returncode is None:
+            with contextlib.suppress(ProcessLookupError):
+                self.process.kill()
+
+
+class PytestWorkerPool:
+    """
+    Pool of persistent pytest workers.
+
+    Workers are started lazily on first use and reused for subsequent jobs.
+    A worker that times out or crashes is discarded and replaced on demand.
+    """
+
+    def __init__(self, size: int = 2):
+        self.size = max(1, size)
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._idle: List[PytestWorker] = []
+        self._workers: List[PytestWorker] = []
+
+    async def _acquire(self) -> PytestWorker:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+        await self._slots.acquire()
+        try:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.alive:
+                    return worker
+                self._workers.remove(worker)
+            worker = await PytestWorker.start()
+        except BaseException:
+            self._slots.release()
+            raise
+        self._workers.append(worker)
+        return worker
+
+    def _release(self, worker: PytestWorker) -> None:
+        if worker.alive:
+            self._idle.append(worker)
+        elif worker in self._workers:
+            self._workers.remove(worker)
+        self._slots.release()
+
+    async def run(self, args: List[str], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Run pytest with the given arguments on a pooled worker.
+
+        Args:
+            args: Command-line arguments passed to pytest.main
+            timeout: Maximum number of seconds to wait for the job
+
+        Returns:
+            Dictionary with returncode, stdout and stderr of the run
+
+        Raises:
+            asyncio.TimeoutError: If the job does not finish within timeout
+        """
+        worker = await self._acquire()
+        try:
+            return await asyncio.wait_for(worker.run(args), timeout=timeout)
+        except BaseException:
+            # The worker may be mid-job; it cannot be trusted with another one
+            worker.kill()
+            raise
+        finally:
+            self._release(worker)
+
+    async def close(self) -> None:
+        """Stop all workers in the pool."""
+        workers, self._workers = self._workers, []
+        self._idle = []
+        for worker in workers:
+            await worker.close()
+
+
+if __name__ == '__main__':
+    main()
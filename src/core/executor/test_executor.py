@@ -4,8 +4,9 @@ Handles the execution of generated Playwright test scripts with comprehensive mo
 """
 
 import asyncio
+import importlib.util
 import json
-import subprocess
+import os
 import sys
 import tempfile
 import time
@@ -15,10 +16,11 @@ from typing import Dict, List, Optional, Any, Tuple
 import psutil
 import traceback
 
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+from playwright.async_api import async_playwright
 from utils.logger import setup_logger
 from monitoring.performance.performance_monitor import PerformanceMonitor
 from monitoring.errors.error_detector import ErrorDetector
+from core.executor.pytest_worker import PytestWorkerPool
 
 
 class TestExecutor:
@@ -27,17 +29,22 @@ class TestExecutor:
     Supports both direct script execution and file-based execution.
     """
     
-    def __init__(self):
-        """Initialize the Test Executor."""
+    def __init__(self, worker_count: int = 2):
+        """
+        Initialize the Test Executor.
+        
+        Args:
+            worker_count: Number of persistent pytest workers used to run scripts
+        """
         self.logger = setup_logger(__name__)
         self.performance_monitor = PerformanceMonitor()
         self.error_detector = ErrorDetector()
+        self.worker_pool = PytestWorkerPool(size=worker_count)
         
         # Runtime state
         self.playwright = None
-        self.active_browsers: Dict[str, Browser] = {}
-        self.active_contexts: Dict[str, BrowserContext] = {}
         self.execution_metrics: Dict[str, Any] = {}
+        self._pytest_argv_base: Optional[List[str]] = None
         
     async def initialize(self) -> None:
         """Initialize the executor and its dependencies."""
@@ -47,6 +54,9 @@ class TestExecutor:
             # Initialize Playwright
             self.playwright = await async_playwright().start()
             
+            # Fixed pytest arguments shared by every script run
+            self._pytest_argv_base = self._build_pytest_argv_base()
+            
             # Initialize monitoring components
             await self.performance_monitor.initialize()
             await self.error_detector.initialize()
@@ -55,7 +65,36 @@ class TestExecutor:
             
         except Exception as e:
             self.logger.error(f"Failed to initialize Test Executor: {str(e)}")
-            raise    
+            raise
+
+    @staticmethod
+    def _build_pytest_argv_base() -> List[str]:
+        """
+        Build the pytest arguments common to every script run.
+        
+        Generated scripts need no project configuration, so config-file
+        discovery (-c devnull), the cache provider and the header are skipped.
+        Importlib mode keeps script directories off sys.path; the worker
+        drops each job's own modules afterwards so same-named scripts from
+        later jobs are imported afresh.
+        
+        Returns:
+            List of pytest command-line arguments
+        """
+        argv = [
+            '-p', 'no:cacheprovider',
+            '-p', 'no:hypothesis',
+            '--no-header',
+            '-q',
+            '-c', os.devnull,
+            '--import-mode=importlib',
+            '--tb=short'
+        ]
+        # Only request a JSON report when the pytest-json-report plugin is installed
+        if importlib.util.find_spec('pytest_jsonreport') is not None:
+            argv.append('--json-report')
+        return argv
+    
     async def execute_script_file(
         self,
         script_path: str,
@@ -225,10 +264,11 @@ class TestExecutor:
         self.logger.info("Shutting down Test Executor...")
         
         try:
-            # Cleanup any running browser instances
-            if hasattr(self, 'browser') and self.browser:
-                await self.browser.close()
-                
+            # Scripts launch and close their own browsers in the pytest workers
+            if self.playwright:
+                await self.playwright.stop()
+                self.playwright = None
+
             # Cleanup temporary directories
             if hasattr(self, 'temp_dirs'):
                 for temp_dir in self.temp_dirs:
@@ -244,6 +284,9 @@ class TestExecutor:
         except Exception as e:
             self.logger.error(f"Error during Test Executor shutdown: {str(e)}")
             # Don't raise, just log the error
+        finally:
+            # Stop persistent pytest workers even if a browser failed to close
+            await self.worker_pool.close()
     
     async def _execute_with_monitoring(
         self,
@@ -259,36 +302,29 @@ class TestExecutor:
             execution_result: Dictionary to store execution results
             config: Test configuration
         """
-        import subprocess
-        import sys
-        import json
-        from pathlib import Path
-        
         script_path = execution_env['enhanced_script_path']
         temp_dir = execution_env['temp_dir']
         
         self.logger.info(f"Executing script with monitoring: {script_path}")
         
         try:
-            # Prepare pytest command
-            cmd = [
-                sys.executable,
-                '-m', 'pytest',
-                script_path,
-                '-v',
-                '--json-report',
-                '--json-report-file=' + str(Path(temp_dir) / 'report.json'),
-                '--tb=short'
+            # Prepare pytest arguments
+            if self._pytest_argv_base is None:
+                self._pytest_argv_base = self._build_pytest_argv_base()
+            pytest_args = [
+                *self._pytest_argv_base,
+                '--rootdir=' + str(temp_dir),
+                script_path
             ]
+            if '--json-report' in self._pytest_argv_base:
+                pytest_args.append('--json-report-file=' + str(Path(temp_dir) / 'report.json'))
             
             # Add performance monitoring
             start_time = time.time()
             
-            # Execute the script
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
+            # Execute the script on a persistent pytest worker
+            result = await self.worker_pool.run(
+                pytest_args,
                 timeout=300  # 5 minute timeout
             )
             
@@ -322,30 +358,30 @@ class TestExecutor:
                         })
             
             # Capture console output
-            if result.stdout:
+            if result['stdout']:
                 execution_result['console_logs'].append({
                     'type': 'stdout',
-                    'content': result.stdout,
+                    'content': result['stdout'],
                     'timestamp': datetime.now().isoformat()
                 })
             
-            if result.stderr:
+            if result['stderr']:
                 execution_result['console_logs'].append({
                     'type': 'stderr',
-                    'content': result.stderr,
+                    'content': result['stderr'],
                     'timestamp': datetime.now().isoformat()
                 })
             
             # Check return code
-            if result.returncode != 0:
+            if result['returncode'] != 0:
                 execution_result['errors'].append({
                     'type': 'execution_error',
-                    'message': f"Script execution failed with return code: {result.returncode}",
-                    'stdout': result.stdout,
-                    'stderr': result.stderr
+                    'message': f"Script execution failed with return code: {result['returncode']}",
+                    'stdout': result['stdout'],
+                    'stderr': result['stderr']
                 })
                 
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             execution_result['errors'].append({
                 'type': 'timeout',
                 'message': 'Script execution timed out after 300 seconds'
@@ -6,17 +6,45 @@ Handles authentication state, cookies, and session persistence across test execu
 import asyncio
 import json
 import pickle
+import re
+import sys
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass, asdict
-import aiofiles
+from functools import lru_cache
+from urllib.parse import urlparse
+
+# orjson reads and writes persisted sessions considerably faster when available
+try:
+    import orjson
+
+    def _json_dumps(data: Any) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(data: Any) -> bytes:
+        return json.dumps(data, indent=2).encode('utf-8')
+
+    _json_loads = json.loads
 
 from playwright.async_api import BrowserContext, Page, Cookie
 from utils.logger import setup_logger
 
 
-@dataclass
+# Cookie and storage names that carry auth state; covers sessionid, access_token,
+# refresh_token, auth_token and authorization as substrings
+_AUTH_RE = re.compile(r'session|auth|token|jwt', re.IGNORECASE)
+
+# Sessions are created often and cached for their whole lifetime, so drop the
+# per-instance __dict__; slots need Python 3.10+
+_SESSION_DATACLASS_OPTIONS: Dict[str, bool] = (
+    {"slots": True} if sys.version_info >= (3, 10) else {}
+)
+
+
+@dataclass(**_SESSION_DATACLASS_OPTIONS)
 class SessionData:
     """Container for session authentication data."""
     session_id: str
@@ -30,9 +58,9 @@ class SessionData:
     auth_tokens: Dict[str, str]
     is_valid: bool = True
     
-    def is_expired(self) -> bool:
-        """Check if the session has expired."""
-        return datetime.now() > self.expires_at
+    def is_expired(self, now: Optional[datetime] = None) -> bool:
+        """Check if the session has expired, optionally as of a given time."""
+        return (now or datetime.now()) > self.expires_at
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert session data to dictionary for serialization."""
@@ -72,17 +100,22 @@ class SessionManager:
     Handles login once and reuses the session for subsequent tests.
     """
     
-    def __init__(self, session_timeout_minutes: int = 30):
+    def __init__(
+        self,
+        session_timeout_minutes: int = 30,
+        sessions_dir: Union[str, Path] = "sessions"
+    ):
         """
         Initialize the Session Manager.
         
         Args:
             session_timeout_minutes: Session validity duration in minutes
+            sessions_dir: Directory where sessions are persisted
         """
         self.logger = setup_logger(__name__)
         self.session_timeout = timedelta(minutes=session_timeout_minutes)
-        self.sessions_dir = Path("sessions")
-        self.sessions_dir.mkdir(exist_ok=True)
+        self.sessions_dir = Path(sessions_dir)
+        self.sessions_dir.mkdir(parents=True, exist_ok=True)
         
         # In-memory session cache
         self.active_sessions: Dict[str, SessionData] = {}
@@ -212,6 +245,10 @@ class SessionManager:
             # Login tests don't need session injection
             return test_code
         
+        # Serialize once; the same snippet is injected after every new page
+        cookies_json = json.dumps(session_data.cookies)
+        local_storage_json = json.dumps(session_data.local_storage)
+        
         # Find the appropriate injection point
         lines = test_code.split('\n')
         modified_lines = []
@@ -226,7 +263,7 @@ class SessionManager:
                 modified_lines.extend([
                     '',
                     '    # Restore authentication session',
-                    f'    await context.add_cookies({json.dumps(session_data.cookies)})',
+                    f'    await context.add_cookies({cookies_json})',
                     ''
                 ])
                 
@@ -239,7 +276,7 @@ class SessionManager:
                         '        for (const [key, value] of Object.entries(storage)) {',
                         '            localStorage.setItem(key, value);',
                         '        }',
-                        f'    }}""", {json.dumps(session_data.local_storage)})',
+                        f'    }}""", {local_storage_json})',
                         ''
                     ])
         
@@ -514,8 +551,9 @@ class SessionManager:
         session_file = self.sessions_dir / f"{session_key}.json"
         
         try:
-            async with aiofiles.open(session_file, 'w') as f:
-                await f.write(json.dumps(session_data.to_dict(), indent=2))
+            await asyncio.to_thread(
+                session_file.write_bytes, _json_dumps(session_data.to_dict())
+            )
             
             self.logger.debug(f"Persisted session to {session_file}")
         except Exception as e:
@@ -537,8 +575,7 @@ class SessionManager:
             return None
         
         try:
-            async with aiofiles.open(session_file, 'r') as f:
-                data = json.loads(await f.read())
+            data = _json_loads(await asyncio.to_thread(session_file.read_bytes))
             
             return SessionData.from_dict(data)
         except Exception as e:
@@ -547,13 +584,13 @@ class SessionManager:
     
     async def _load_persisted_sessions(self) -> None:
         """Load all persisted sessions from disk."""
+        now = datetime.now()
         for session_file in self.sessions_dir.glob("*.json"):
             try:
-                async with aiofiles.open(session_file, 'r') as f:
-                    data = json.loads(await f.read())
+                data = _json_loads(await asyncio.to_thread(session_file.read_bytes))
                 
                 session = SessionData.from_dict(data)
-                if not session.is_expired() and session.is_valid:
+                if not session.is_expired(now) and session.is_valid:
                     session_key = session_file.stem
                     self.active_sessions[session_key] = session
             except Exception as e:
@@ -562,9 +599,10 @@ class SessionManager:
     async def _cleanup_expired_sessions(self) -> None:
         """Remove expired sessions from memory and disk."""
         # Clean up in-memory sessions
+        now = datetime.now()
         expired_keys = [
             key for key, session in self.active_sessions.items()
-            if session.is_expired()
+            if session.is_expired(now)
         ]
         
         for key in expired_keys:
@@ -577,7 +615,9 @@ class SessionManager:
         if expired_keys:
             self.logger.info(f"Cleaned up {len(expired_keys)} expired sessions")
     
-    def _generate_session_key(self, url: str, username: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _generate_session_key(url: str, username: str) -> str:
         """
         Generate a unique session key.
         
@@ -589,11 +629,10 @@ class SessionManager:
             Session key string
         """
         # Extract domain from URL
-        from urllib.parse import urlparse
         domain = urlparse(url).netloc
         
-        # Create session key
-        return f"{domain}_{username}".replace('.', '_').replace(':', '_')
+        # Create session key; only the host is flattened so usernames stay distinct
+        return f"{domain.replace('.', '_').replace(':', '_')}_{username}"
     
     def _extract_auth_tokens(
         self,
@@ -612,23 +651,14 @@ class SessionManager:
         """
         auth_tokens = {}
         
-        # Common auth cookie names
-        auth_cookie_names = [
-            'session', 'sessionid', 'auth', 'token',
-            'access_token', 'refresh_token', 'jwt',
-            'authorization', 'auth_token'
-        ]
-        
         # Extract from cookies
         for cookie in cookies:
-            name = cookie.get('name', '').lower()
-            if any(auth_name in name for auth_name in auth_cookie_names):
+            if _AUTH_RE.search(cookie.get('name', '')):
                 auth_tokens[f"cookie_{cookie['name']}"] = cookie['value']
         
         # Extract from local storage
         for key, value in local_storage.items():
-            key_lower = key.lower()
-            if any(auth_name in key_lower for auth_name in auth_cookie_names):
+            if _AUTH_RE.search(key):
                 auth_tokens[f"storage_{key}"] = value
         
         return auth_tokens
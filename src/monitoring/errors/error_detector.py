@@ -1,13 +1,18 @@
 """Error Detector - Detects and categorizes errors during test execution."""
 
+import asyncio
 import logging
+import time
 import traceback
-from typing import Dict, Any, List, Optional, Callable, Set
+from typing import Dict, Any, List, Optional, Callable, Set, Tuple
 from datetime import datetime
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field, InitVar
 import re
+import sys
 import json
+from collections import defaultdict
 from enum import Enum
+from operator import attrgetter
 
 logger = logging.getLogger(__name__)
 
@@ -34,34 +39,110 @@ class ErrorCategory(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+# Slotted dataclasses need Python 3.10+; older interpreters fall back to __dict__
+_DATACLASS_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class Error:
-    """Represents a detected error."""
+    """Represents a detected error.
+    
+    The detection time is stored as integer nanoseconds since the epoch and
+    only turned into a datetime when ``timestamp`` is read. Passing
+    ``timestamp=<datetime>`` to the constructor is still supported.
+    """
     message: str
     category: ErrorCategory
     severity: ErrorSeverity
-    timestamp: datetime
-    source: str
+    timestamp_ns: int = field(default_factory=time.time_ns)
+    source: str = "unknown"
     stack_trace: Optional[str] = None
     url: Optional[str] = None
     line_number: Optional[int] = None
     column_number: Optional[int] = None
     metadata: Optional[Dict[str, Any]] = None
+    count: int = 1  # Occurrences folded into this error when deduplicating
+    timestamp: InitVar[Optional[datetime]] = None
+    
+    def __post_init__(self, timestamp: Optional[datetime]) -> None:
+        if timestamp is not None:
+            self.timestamp_ns = (
+                int(timestamp.timestamp()) * 1_000_000_000 + timestamp.microsecond * 1_000
+            )
+
+
+def _error_timestamp(self: Error) -> datetime:
+    """Detection time as a local datetime."""
+    seconds, nanos = divmod(self.timestamp_ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=nanos // 1_000)
+
+
+# Installed after the dataclass is built so the ``timestamp`` init argument
+# (an InitVar) and the read-only attribute can share a name
+Error.timestamp = property(_error_timestamp)
+
+
+# Severity for HTTP error statuses; anything else below 500 is MEDIUM
+_HTTP_ERROR_SEVERITY: Dict[int, ErrorSeverity] = {
+    **{code: ErrorSeverity.HIGH for code in range(400, 500)},
+    **{code: ErrorSeverity.CRITICAL for code in range(500, 600)},
+}
+
+
+# Variable parts of error messages (UUIDs, numbers) ignored when deduplicating
+_VARIABLE_PARTS_RE = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|\d+", re.I
+)
+
+
+# Pending page events buffered before being drained, and drained per batch
+_EVENT_QUEUE_SIZE = 1024
+_EVENT_BATCH_SIZE = 64
+
+
+# Plain (non-enum, non-datetime) fields copied verbatim by export_errors
+_EXPORT_GETTER = attrgetter(
+    "message", "source", "stack_trace", "url", "line_number", "column_number", "metadata",
+    "count"
+)
 
 
 class ErrorDetector:
-    """Detects and categorizes errors during test execution."""
+    """Detects and categorizes errors during test execution.
     
-    def __init__(self):
+    Once a page is attached with set_page, its events are recorded by a
+    background task, so ``errors`` and the readers built on it (summaries,
+    analysis, export) only include them after ``await flush()``.
+    """
+    
+    def __init__(self, deduplicate: bool = False):
+        """Initialize the error detector.
+        
+        Args:
+            deduplicate: Fold repeated errors (same category and message up to
+                numbers/UUIDs) into one stored Error with an occurrence count
+        """
         self.logger = logger
         self.errors: List[Error] = []
+        self.deduplicate = deduplicate
+        self._seen_errors: Dict[Tuple[ErrorCategory, str], Error] = {}
         self.page = None
         self.error_patterns: Dict[ErrorCategory, List[re.Pattern]] = self._init_error_patterns()
-        self._error_callbacks: Dict[ErrorCategory, List[Callable]] = {}
-        self._console_handlers = []
-        self._network_handlers = []
+        self._error_callbacks: Dict[ErrorCategory, List[Callable]] = defaultdict(list)
+        self._console_handlers: List[Tuple[str, Callable]] = []
+        self._network_handlers: List[Tuple[str, Callable]] = []
         self._js_error_handler = None
         self.ignored_patterns: Set[re.Pattern] = set()
+        
+        # Page events are queued by the listeners and recorded by a drain task
+        self._event_recorders: Dict[str, Callable] = {
+            "console": self._record_console_message,
+            "pageerror": self._record_page_error,
+            "response": self._record_response,
+            "requestfailed": self._record_request_failed,
+        }
+        self._event_queue: Optional[asyncio.Queue] = None
+        self._drain_task: Optional[asyncio.Task] = None
     
     def _init_error_patterns(self) -> Dict[ErrorCategory, List[re.Pattern]]:
         """Initialize error detection patterns."""
@@ -111,100 +192,164 @@ class ErrorDetector:
     
     async def initialize(self) -> None:
         """Initialize the error detector."""
-        self.errors.clear()
+        self.clear_errors()
         self.logger.info("Error detector initialized")
     
     def set_page(self, page) -> None:
         """Set the Playwright page instance for monitoring."""
         self.page = page
+        self._start_event_drain()
         self._setup_page_listeners()
     
+    def _start_event_drain(self) -> None:
+        """Start the task that records queued page events.
+        
+        Without a running event loop, events are recorded inline instead.
+        """
+        if self._drain_task is not None and not self._drain_task.done():
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._event_queue = asyncio.Queue(maxsize=_EVENT_QUEUE_SIZE)
+        self._drain_task = asyncio.create_task(self._drain_events())
+    
+    async def _drain_events(self) -> None:
+        """Record queued page events in batches."""
+        queue = self._event_queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < _EVENT_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+            
+            for event, payload in batch:
+                try:
+                    self._event_recorders[event](payload)
+                except Exception as e:
+                    self.logger.error(f"Error recording {event} event: {e}")
+                finally:
+                    queue.task_done()
+    
+    def _enqueue_event(self, event: str, payload: Any) -> None:
+        """Hand a page event to the drain task, or record it inline."""
+        if self._event_queue is not None:
+            try:
+                self._event_queue.put_nowait((event, payload))
+                return
+            except asyncio.QueueFull:
+                self.logger.warning(f"Error event queue full; recording {event} event inline")
+        self._event_recorders[event](payload)
+    
+    async def flush(self) -> None:
+        """Wait until all queued page events have been recorded.
+        
+        Call this before reading ``errors``, get_error_summary, analyze_errors
+        or export_errors while a page is attached.
+        """
+        if self._event_queue is not None and self._drain_task is not None and not self._drain_task.done():
+            await self._event_queue.join()
+    
     def _setup_page_listeners(self) -> None:
         """Set up event listeners on the page."""
         if not self.page:
             return
         
-        # Console message handler
-        async def handle_console_message(msg):
-            if msg.type() in ['error', 'warning']:
-                error = Error(
-                    message=msg.text(),
-                    category=ErrorCategory.CONSOLE,
-                    severity=ErrorSeverity.HIGH if msg.type() == 'error' else ErrorSeverity.MEDIUM,
-                    timestamp=datetime.now(),
-                    source="console",
-                    url=self.page.url if self.page else None,
-                    metadata={"type": msg.type()}
-                )
-                self._add_error(error)
-        
-        self._console_handlers.append(handle_console_message)
-        self.page.on("console", handle_console_message)
-        
-        # Page error handler (uncaught exceptions)
-        async def handle_page_error(error):
-            js_error = Error(
-                message=str(error),
-                category=ErrorCategory.JAVASCRIPT,
-                severity=ErrorSeverity.CRITICAL,
-                timestamp=datetime.now(),
-                source="page_error",
-                stack_trace=error.stack if hasattr(error, 'stack') else None,
-                url=self.page.url if self.page else None
-            )
-            self._add_error(js_error)
-        
-        self._js_error_handler = handle_page_error
-        self.page.on("pageerror", handle_page_error)
-        
-        # Response handler for network errors
-        async def handle_response(response):
-            if response.status >= 400:
-                error = Error(
-                    message=f"HTTP {response.status} for {response.url}",
-                    category=ErrorCategory.NETWORK,
-                    severity=self._get_http_error_severity(response.status),
-                    timestamp=datetime.now(),
-                    source="network",
-                    url=response.url,
-                    metadata={
-                        "status": response.status,
-                        "status_text": response.status_text,
-                        "method": response.request.method
-                    }
-                )
-                self._add_error(error)
-        
-        self._network_handlers.append(handle_response)
-        self.page.on("response", handle_response)
-        
-        # Request failed handler
-        async def handle_request_failed(request):
-            error = Error(
-                message=f"Request failed: {request.url}",
-                category=ErrorCategory.NETWORK,
-                severity=ErrorSeverity.HIGH,
-                timestamp=datetime.now(),
-                source="network",
-                url=request.url,
-                metadata={
-                    "method": request.method,
-                    "failure": request.failure
-                }
-            )
-            self._add_error(error)
-        
-        self._network_handlers.append(handle_request_failed)
-        self.page.on("requestfailed", handle_request_failed)
+        # Handlers are bound methods registered once per page, so no closure
+        # is built here and no coroutine is scheduled per Playwright event;
+        # they only filter and enqueue, recording happens in the drain task
+        self._console_handlers.append(("console", self._handle_console_message))
+        self._js_error_handler = self._handle_page_error
+        self._network_handlers.append(("response", self._handle_response))
+        self._network_handlers.append(("requestfailed", self._handle_request_failed))
+        
+        for event, handler in self._console_handlers:
+            self.page.on(event, handler)
+        self.page.on("pageerror", self._js_error_handler)
+        for event, handler in self._network_handlers:
+            self.page.on(event, handler)
+    
+    def _handle_console_message(self, msg) -> None:
+        """Queue console errors and warnings."""
+        if msg.type in ('error', 'warning'):
+            self._enqueue_event("console", msg)
+    
+    def _handle_page_error(self, error) -> None:
+        """Queue uncaught page exceptions."""
+        self._enqueue_event("pageerror", error)
+    
+    def _handle_response(self, response) -> None:
+        """Queue HTTP error responses."""
+        if response.status >= 400:
+            self._enqueue_event("response", response)
+    
+    def _handle_request_failed(self, request) -> None:
+        """Queue requests that failed to complete."""
+        self._enqueue_event("requestfailed", request)
+    
+    def _record_console_message(self, msg) -> None:
+        """Record a console error or warning."""
+        msg_type = msg.type
+        error = Error(
+            message=msg.text,
+            category=ErrorCategory.CONSOLE,
+            severity=ErrorSeverity.HIGH if msg_type == 'error' else ErrorSeverity.MEDIUM,
+            source="console",
+            url=self.page.url if self.page else None,
+            metadata={"type": msg_type}
+        )
+        self._add_error(error)
+    
+    def _record_page_error(self, error) -> None:
+        """Record an uncaught page exception."""
+        js_error = Error(
+            message=str(error),
+            category=ErrorCategory.JAVASCRIPT,
+            severity=ErrorSeverity.CRITICAL,
+            source="page_error",
+            stack_trace=error.stack if hasattr(error, 'stack') else None,
+            url=self.page.url if self.page else None
+        )
+        self._add_error(js_error)
+    
+    def _record_response(self, response) -> None:
+        """Record an HTTP error response."""
+        error = Error(
+            message=f"HTTP {response.status} for {response.url}",
+            category=ErrorCategory.NETWORK,
+            severity=self._get_http_error_severity(response.status),
+            source="network",
+            url=response.url,
+            metadata={
+                "status": response.status,
+                "status_text": response.status_text,
+                "method": response.request.method
+            }
+        )
+        self._add_error(error)
+    
+    def _record_request_failed(self, request) -> None:
+        """Record a request that failed to complete."""
+        error = Error(
+            message=f"Request failed: {request.url}",
+            category=ErrorCategory.NETWORK,
+            severity=ErrorSeverity.HIGH,
+            source="network",
+            url=request.url,
+            metadata={
+                "method": request.method,
+                "failure": request.failure
+            }
+        )
+        self._add_error(error)
     
     def _get_http_error_severity(self, status_code: int) -> ErrorSeverity:
         """Determine severity based on HTTP status code."""
-        if status_code >= 500:
-            return ErrorSeverity.CRITICAL
-        elif status_code >= 400:
-            return ErrorSeverity.HIGH
-        else:
-            return ErrorSeverity.MEDIUM
+        severity = _HTTP_ERROR_SEVERITY.get(status_code)
+        if severity is None:
+            # Non-standard codes outside the table keep the threshold rules
+            severity = ErrorSeverity.CRITICAL if status_code >= 500 else ErrorSeverity.MEDIUM
+        return severity
     
     def detect_error(self, message: str, source: str = "unknown", **kwargs) -> Optional[Error]:
         """Detect and categorize an error from a message."""
@@ -221,7 +366,6 @@ class ErrorDetector:
             message=message,
             category=category,
             severity=severity,
-            timestamp=datetime.now(),
             source=source,
             stack_trace=kwargs.get('stack_trace'),
             url=kwargs.get('url'),
@@ -230,8 +374,7 @@ class ErrorDetector:
             metadata=kwargs.get('metadata')
         )
         
-        self._add_error(error)
-        return error
+        return self._add_error(error)
     
     def _categorize_error(self, message: str) -> ErrorCategory:
         """Categorize an error based on its message."""
@@ -267,23 +410,36 @@ class ErrorDetector:
         
         return ErrorSeverity.LOW
     
-    def _add_error(self, error: Error) -> None:
-        """Add an error and notify callbacks."""
-        self.errors.append(error)
-        self.logger.error(f"Detected {error.severity.value} {error.category.value} error: {error.message}")
+    def _add_error(self, error: Error) -> Error:
+        """Add an error and notify callbacks.
+        
+        Returns the stored error, which is an earlier occurrence when the
+        error was folded into it by deduplication.
+        """
+        is_repeat = False
+        if self.deduplicate:
+            key = (error.category, _VARIABLE_PARTS_RE.sub("N", error.message))
+            stored = self._seen_errors.setdefault(key, error)
+            if stored is not error:
+                stored.count += 1
+                error = stored
+                is_repeat = True
+        
+        if not is_repeat:
+            self.errors.append(error)
+            self.logger.error(f"Detected {error.severity.value} {error.category.value} error: {error.message}")
         
         # Notify callbacks
-        if error.category in self._error_callbacks:
-            for callback in self._error_callbacks[error.category]:
-                try:
-                    callback(error)
-                except Exception as e:
-                    self.logger.error(f"Error in error callback: {e}")
+        for callback in self._error_callbacks.get(error.category, ()):
+            try:
+                callback(error)
+            except Exception as e:
+                self.logger.error(f"Error in error callback: {e}")
+        
+        return error
     
     def register_error_callback(self, category: ErrorCategory, callback: Callable) -> None:
         """Register a callback for specific error categories."""
-        if category not in self._error_callbacks:
-            self._error_callbacks[category] = []
         self._error_callbacks[category].append(callback)
     
     def add_ignored_pattern(self, pattern: str) -> None:
@@ -303,24 +459,24 @@ class ErrorDetector:
         return self.get_errors_by_severity(ErrorSeverity.CRITICAL)
     
     def get_error_summary(self) -> Dict[str, Any]:
-        """Get a summary of all detected errors."""
+        """Get a summary of all recorded errors; await flush() first to include queued page events."""
         summary = {
-            "total_errors": len(self.errors),
+            "total_errors": sum(e.count for e in self.errors),
             "by_category": {},
             "by_severity": {},
-            "critical_errors": len(self.get_critical_errors()),
+            "critical_errors": sum(e.count for e in self.get_critical_errors()),
             "recent_errors": []
         }
         
         # Count by category
         for category in ErrorCategory:
-            count = len(self.get_errors_by_category(category))
+            count = sum(e.count for e in self.get_errors_by_category(category))
             if count > 0:
                 summary["by_category"][category.value] = count
         
         # Count by severity
         for severity in ErrorSeverity:
-            count = len(self.get_errors_by_severity(severity))
+            count = sum(e.count for e in self.get_errors_by_severity(severity))
             if count > 0:
                 summary["by_severity"][severity.value] = count
         
@@ -339,7 +495,7 @@ class ErrorDetector:
         return summary
     
     def analyze_errors(self) -> Dict[str, Any]:
-        """Analyze detected errors and provide insights."""
+        """Analyze recorded errors and provide insights; await flush() first to include queued page events."""
         analysis = {
             "status": "unknown",
             "issues": [],
@@ -355,14 +511,16 @@ class ErrorDetector:
         critical_errors = self.get_critical_errors()
         if critical_errors:
             analysis["status"] = "critical"
-            analysis["issues"].append(f"Found {len(critical_errors)} critical errors")
+            analysis["issues"].append(
+                f"Found {sum(e.count for e in critical_errors)} critical errors"
+            )
             for error in critical_errors[:3]:  # Show first 3
                 analysis["issues"].append(f"- {error.category.value}: {error.message[:100]}")
         
         # Analyze patterns
         category_counts = {}
         for error in self.errors:
-            category_counts[error.category] = category_counts.get(error.category, 0) + 1
+            category_counts[error.category] = category_counts.get(error.category, 0) + error.count
         
         # Find most common error types
         sorted_categories = sorted(category_counts.items(), key=lambda x: x[1], reverse=True)
@@ -393,11 +551,12 @@ class ErrorDetector:
             analysis["recommendations"].append("Address security policy violations")
         
         # Overall status
+        total_errors = sum(category_counts.values())
         if critical_errors:
             analysis["status"] = "critical"
-        elif len(self.errors) > 10:
+        elif total_errors > 10:
             analysis["status"] = "poor"
-        elif len(self.errors) > 5:
+        elif total_errors > 5:
             analysis["status"] = "fair"
         else:
             analysis["status"] = "good"
@@ -405,44 +564,57 @@ class ErrorDetector:
         return analysis
     
     def export_errors(self) -> List[Dict[str, Any]]:
-        """Export all errors as a list of dictionaries."""
+        """Export recorded errors as dictionaries; await flush() first to include queued page events."""
         return [
             {
-                "message": e.message,
+                "message": message,
                 "category": e.category.value,
                 "severity": e.severity.value,
                 "timestamp": e.timestamp.isoformat(),
-                "source": e.source,
-                "stack_trace": e.stack_trace,
-                "url": e.url,
-                "line_number": e.line_number,
-                "column_number": e.column_number,
-                "metadata": e.metadata
+                "source": source,
+                "stack_trace": stack_trace,
+                "url": url,
+                "line_number": line_number,
+                "column_number": column_number,
+                "metadata": metadata,
+                "count": count
             }
             for e in self.errors
+            for (message, source, stack_trace, url, line_number, column_number, metadata, count)
+            in (_EXPORT_GETTER(e),)
         ]
     
     def clear_errors(self) -> None:
         """Clear all recorded errors."""
         self.errors.clear()
+        self._seen_errors.clear()
     
     async def cleanup(self) -> None:
-        """Clean up event listeners."""
+        """Clean up event listeners and record any still-queued page events."""
         if self.page:
             # Remove event listeners
-            for handler in self._console_handlers:
-                self.page.remove_listener("console", handler)
+            for event, handler in self._console_handlers:
+                self.page.remove_listener(event, handler)
             
             if self._js_error_handler:
                 self.page.remove_listener("pageerror", self._js_error_handler)
             
-            for handler in self._network_handlers:
-                self.page.remove_listener("response", handler)
-                self.page.remove_listener("requestfailed", handler)
+            for event, handler in self._network_handlers:
+                self.page.remove_listener(event, handler)
         
         self._console_handlers.clear()
         self._network_handlers.clear()
         self._js_error_handler = None
+        
+        if self._drain_task is not None:
+            await self.flush()
+            self._drain_task.cancel()
+            try:
+                await self._drain_task
+            except asyncio.CancelledError:
+                pass
+        self._drain_task = None
+        self._event_queue = None
     
     async def shutdown(self) -> None:
         """Shutdown the error detector."""
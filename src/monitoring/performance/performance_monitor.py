@@ -1,17 +1,31 @@
 """Performance Monitor - Tracks and analyzes performance metrics during test execution."""
 
 import logging
+import sys
 import time
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, Deque, Iterable, List, Optional, Callable
 from datetime import datetime
 import asyncio
-from dataclasses import dataclass, asdict
+from collections import defaultdict, deque
+from dataclasses import dataclass, asdict, fields
 import json
 
+# orjson serializes dataclasses natively and considerably faster when available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Metrics are recorded once and never modified, so they are frozen; slots need
+# Python 3.10+ and older interpreters fall back to __dict__
+_METRIC_DATACLASS_OPTIONS: Dict[str, bool] = (
+    {"frozen": True, "slots": True} if sys.version_info >= (3, 10) else {"frozen": True}
+)
 
-@dataclass
+
+@dataclass(**_METRIC_DATACLASS_OPTIONS)
 class PerformanceMetric:
     """Represents a performance metric."""
     name: str
@@ -33,23 +47,186 @@ class WebVitals:
     tti: Optional[float] = None  # Time to Interactive
 
 
+_WEB_VITAL_NAMES = frozenset(f.name for f in fields(WebVitals))
+
+# (vital, label, unit suffix, good up to, needs improvement up to) for scoring;
+# anything above the second threshold is poor
+_VITAL_THRESHOLDS = (
+    ('lcp', 'LCP', 'ms', 2500, 4000),
+    ('fid', 'FID', 'ms', 100, 300),
+    ('cls', 'CLS', '', 0.1, 0.25)
+)
+
+# Units for the client-side metrics reported by the injected script
+_METRIC_UNITS = {
+    'lcp': 'ms',
+    'fcp': 'ms',
+    'fid': 'ms',
+    'cls': 'score',
+    'ttfb': 'ms',
+    'tti': 'ms',
+    'domContentLoaded': 'ms',
+    'loadComplete': 'ms'
+}
+
+
+# Client-side monitor that observes LCP, FID and CLS and records navigation timing
+_INJECT_JS = """
+    window.__performanceMonitor = {
+        metrics: {},
+        observers: [],
+        
+        init: function() {
+            // Observe Largest Contentful Paint
+            if ('PerformanceObserver' in window) {
+                const lcpObserver = new PerformanceObserver((list) => {
+                    const entries = list.getEntries();
+                    const lastEntry = entries[entries.length - 1];
+                    this.metrics.lcp = lastEntry.renderTime || lastEntry.loadTime;
+                });
+                lcpObserver.observe({ entryTypes: ['largest-contentful-paint'] });
+                this.observers.push(lcpObserver);
+                
+                // Observe First Input Delay
+                const fidObserver = new PerformanceObserver((list) => {
+                    const entries = list.getEntries();
+                    if (entries.length > 0) {
+                        this.metrics.fid = entries[0].processingStart - entries[0].startTime;
+                    }
+                });
+                fidObserver.observe({ entryTypes: ['first-input'] });
+                this.observers.push(fidObserver);
+                
+                // Observe Cumulative Layout Shift
+                let clsValue = 0;
+                const clsObserver = new PerformanceObserver((list) => {
+                    for (const entry of list.getEntries()) {
+                        if (!entry.hadRecentInput) {
+                            clsValue += entry.value;
+                            this.metrics.cls = clsValue;
+                        }
+                    }
+                });
+                clsObserver.observe({ entryTypes: ['layout-shift'] });
+                this.observers.push(clsObserver);
+            }
+        },
+        
+        getMetrics: function() {
+            // Get navigation timing metrics; read lazily because init() can run
+            // at document start, before these timestamps are set
+            if (window.performance && window.performance.timing) {
+                const timing = window.performance.timing;
+                if (timing.responseStart) {
+                    this.metrics.ttfb = timing.responseStart - timing.fetchStart;
+                }
+                if (timing.domContentLoadedEventEnd) {
+                    this.metrics.domContentLoaded = timing.domContentLoadedEventEnd - timing.navigationStart;
+                }
+                if (timing.loadEventEnd) {
+                    this.metrics.loadComplete = timing.loadEventEnd - timing.navigationStart;
+                }
+            }
+            
+            // Get paint timing
+            if (window.performance && window.performance.getEntriesByType) {
+                const paintEntries = window.performance.getEntriesByType('paint');
+                paintEntries.forEach(entry => {
+                    if (entry.name === 'first-contentful-paint') {
+                        this.metrics.fcp = entry.startTime;
+                    }
+                });
+            }
+            
+            // Calculate Time to Interactive (simplified)
+            if (this.metrics.domContentLoaded && this.metrics.fcp) {
+                this.metrics.tti = Math.max(this.metrics.domContentLoaded, this.metrics.fcp);
+            }
+            
+            return this.metrics;
+        },
+        
+        cleanup: function() {
+            this.observers.forEach(observer => observer.disconnect());
+            this.observers = [];
+        }
+    };
+    
+    window.__performanceMonitor.init();
+"""
+
+_CLEANUP_JS = "if (window.__performanceMonitor) { window.__performanceMonitor.cleanup(); }"
+
+# Reads the injected monitor's vitals, resource timing and JS heap usage together
+_COLLECT_METRICS_JS = """
+    () => {
+        const monitor = window.__performanceMonitor;
+        const perf = window.performance;
+        return {
+            vitals: monitor ? monitor.getMetrics() : {},
+            resources: perf && perf.getEntriesByType
+                ? perf.getEntriesByType('resource').map(r => ({
+                    name: r.name,
+                    type: r.initiatorType,
+                    duration: r.duration,
+                    size: r.transferSize || 0
+                }))
+                : [],
+            memory: perf && perf.memory
+                ? {
+                    usedJSHeapSize: perf.memory.usedJSHeapSize,
+                    totalJSHeapSize: perf.memory.totalJSHeapSize,
+                    jsHeapSizeLimit: perf.memory.jsHeapSizeLimit
+                }
+                : null
+        };
+    }
+"""
+
+# Maximum number of metrics kept by each PerformanceMonitor; older ones are dropped
+METRICS_HISTORY_SIZE = 10_000
+
+
 class PerformanceMonitor:
     """Monitors and tracks performance metrics during test execution."""
     
     def __init__(self):
         self.logger = logger
-        self.metrics: List[PerformanceMetric] = []
+        self._metrics: Deque[PerformanceMetric] = deque(maxlen=METRICS_HISTORY_SIZE)
+        self._by_category: Dict[str, Deque[PerformanceMetric]] = defaultdict(deque)
         self.start_time: Optional[float] = None
         self.page = None
+        self._injected_ctx = None
         self.monitoring_active = False
-        self._metric_callbacks: Dict[str, List[Callable]] = {}
+        self._metric_callbacks: Dict[str, List[Callable]] = defaultdict(list)
     
     async def initialize(self) -> None:
         """Initialize the performance monitor."""
+        self.reset()
+        self.logger.info("Performance monitor initialized")
+    
+    def reset(self) -> None:
+        """Discard collected metrics and restart the monitoring clock; callbacks are kept."""
         self.start_time = time.time()
-        self.metrics.clear()
+        self._metrics.clear()
+        self._by_category.clear()
         self.monitoring_active = True
-        self.logger.info("Performance monitor initialized")
+    
+    @property
+    def metrics(self) -> Deque[PerformanceMetric]:
+        """Collected metrics, oldest first."""
+        return self._metrics
+    
+    @metrics.setter
+    def metrics(self, metrics: Iterable[PerformanceMetric]) -> None:
+        self._metrics = deque(metrics, maxlen=METRICS_HISTORY_SIZE)
+        self._reindex()
+    
+    def _reindex(self) -> None:
+        """Rebuild the per-category index from the stored metrics."""
+        self._by_category.clear()
+        for metric in self._metrics:
+            self._by_category[metric.category].append(metric)
     
     def set_page(self, page) -> None:
         """Set the Playwright page instance for monitoring."""
@@ -74,84 +251,19 @@ class PerformanceMonitor:
         self.monitoring_active = False
     
     async def _inject_performance_script(self) -> None:
-        """Inject client-side performance monitoring script."""
+        """Inject client-side performance monitoring script.
+
+        The script is registered once per browser context as an init script so
+        every later navigation picks it up without another round-trip; the
+        page that is already loaded is covered with a single evaluate.
+        """
+        context = self.page.context
+        if self._injected_ctx is context:
+            return
         try:
-            await self.page.evaluate("""
-                window.__performanceMonitor = {
-                    metrics: {},
-                    observers: [],
-                    
-                    init: function() {
-                        // Observe Largest Contentful Paint
-                        if ('PerformanceObserver' in window) {
-                            const lcpObserver = new PerformanceObserver((list) => {
-                                const entries = list.getEntries();
-                                const lastEntry = entries[entries.length - 1];
-                                this.metrics.lcp = lastEntry.renderTime || lastEntry.loadTime;
-                            });
-                            lcpObserver.observe({ entryTypes: ['largest-contentful-paint'] });
-                            this.observers.push(lcpObserver);
-                            
-                            // Observe First Input Delay
-                            const fidObserver = new PerformanceObserver((list) => {
-                                const entries = list.getEntries();
-                                if (entries.length > 0) {
-                                    this.metrics.fid = entries[0].processingStart - entries[0].startTime;
-                                }
-                            });
-                            fidObserver.observe({ entryTypes: ['first-input'] });
-                            this.observers.push(fidObserver);
-                            
-                            // Observe Cumulative Layout Shift
-                            let clsValue = 0;
-                            const clsObserver = new PerformanceObserver((list) => {
-                                for (const entry of list.getEntries()) {
-                                    if (!entry.hadRecentInput) {
-                                        clsValue += entry.value;
-                                        this.metrics.cls = clsValue;
-                                    }
-                                }
-                            });
-                            clsObserver.observe({ entryTypes: ['layout-shift'] });
-                            this.observers.push(clsObserver);
-                        }
-                        
-                        // Get navigation timing metrics
-                        if (window.performance && window.performance.timing) {
-                            const timing = window.performance.timing;
-                            this.metrics.ttfb = timing.responseStart - timing.fetchStart;
-                            this.metrics.domContentLoaded = timing.domContentLoadedEventEnd - timing.navigationStart;
-                            this.metrics.loadComplete = timing.loadEventEnd - timing.navigationStart;
-                        }
-                    },
-                    
-                    getMetrics: function() {
-                        // Get paint timing
-                        if (window.performance && window.performance.getEntriesByType) {
-                            const paintEntries = window.performance.getEntriesByType('paint');
-                            paintEntries.forEach(entry => {
-                                if (entry.name === 'first-contentful-paint') {
-                                    this.metrics.fcp = entry.startTime;
-                                }
-                            });
-                        }
-                        
-                        // Calculate Time to Interactive (simplified)
-                        if (this.metrics.domContentLoaded && this.metrics.fcp) {
-                            this.metrics.tti = Math.max(this.metrics.domContentLoaded, this.metrics.fcp);
-                        }
-                        
-                        return this.metrics;
-                    },
-                    
-                    cleanup: function() {
-                        this.observers.forEach(observer => observer.disconnect());
-                        this.observers = [];
-                    }
-                };
-                
-                window.__performanceMonitor.init();
-            """)
+            await context.add_init_script(_INJECT_JS)
+            await self.page.evaluate(_INJECT_JS)
+            self._injected_ctx = context
         except Exception as e:
             self.logger.error(f"Failed to inject performance script: {e}")
     
@@ -172,39 +284,11 @@ class PerformanceMonitor:
             return {}
         
         try:
-            # Get client-side metrics
-            client_metrics = await self.page.evaluate("window.__performanceMonitor ? window.__performanceMonitor.getMetrics() : {}")
-            
-            # Get resource timing
-            resources = await self.page.evaluate("""
-                () => {
-                    if (!window.performance || !window.performance.getEntriesByType) {
-                        return [];
-                    }
-                    
-                    const resources = window.performance.getEntriesByType('resource');
-                    return resources.map(r => ({
-                        name: r.name,
-                        type: r.initiatorType,
-                        duration: r.duration,
-                        size: r.transferSize || 0
-                    }));
-                }
-            """)
-            
-            # Get memory usage if available
-            memory = await self.page.evaluate("""
-                () => {
-                    if (window.performance && window.performance.memory) {
-                        return {
-                            usedJSHeapSize: window.performance.memory.usedJSHeapSize,
-                            totalJSHeapSize: window.performance.memory.totalJSHeapSize,
-                            jsHeapSizeLimit: window.performance.memory.jsHeapSizeLimit
-                        };
-                    }
-                    return null;
-                }
-            """)
+            # Client-side vitals, resource timing and memory in one round-trip
+            payload = await self.page.evaluate(_COLLECT_METRICS_JS) or {}
+            client_metrics = payload.get('vitals') or {}
+            resources = payload.get('resources') or []
+            memory = payload.get('memory')
             
             # Store metrics
             timestamp = time.time()
@@ -304,99 +388,79 @@ class PerformanceMonitor:
     
     def _add_metric(self, metric: PerformanceMetric) -> None:
         """Add a metric and notify callbacks."""
-        self.metrics.append(metric)
+        if len(self._metrics) == self._metrics.maxlen:
+            # The oldest metric is about to be evicted, and it is also the
+            # oldest entry of its category
+            evicted = self._metrics[0]
+            category_metrics = self._by_category[evicted.category]
+            category_metrics.popleft()
+            if not category_metrics:
+                del self._by_category[evicted.category]
+        self._metrics.append(metric)
+        self._by_category[metric.category].append(metric)
         
         # Notify callbacks
-        if metric.name in self._metric_callbacks:
-            for callback in self._metric_callbacks[metric.name]:
-                try:
-                    callback(metric)
-                except Exception as e:
-                    self.logger.error(f"Error in metric callback: {e}")
+        for callback in self._metric_callbacks.get(metric.name, ()):
+            try:
+                callback(metric)
+            except Exception as e:
+                self.logger.error(f"Error in metric callback: {e}")
     
     def _get_unit_for_metric(self, metric_name: str) -> str:
         """Get the appropriate unit for a metric."""
-        units = {
-            'lcp': 'ms',
-            'fcp': 'ms',
-            'fid': 'ms',
-            'cls': 'score',
-            'ttfb': 'ms',
-            'tti': 'ms',
-            'domContentLoaded': 'ms',
-            'loadComplete': 'ms'
-        }
-        return units.get(metric_name, 'value')
+        return _METRIC_UNITS.get(metric_name, 'value')
     
     def register_metric_callback(self, metric_name: str, callback: Callable) -> None:
         """Register a callback for when a specific metric is collected."""
-        if metric_name not in self._metric_callbacks:
-            self._metric_callbacks[metric_name] = []
         self._metric_callbacks[metric_name].append(callback)
     
+    def clear_metric_callbacks(self) -> None:
+        """Remove every registered metric callback."""
+        self._metric_callbacks.clear()
+    
     async def get_web_vitals(self) -> WebVitals:
         """Get the current Core Web Vitals."""
-        vitals = WebVitals()
+        return self._latest_web_vitals()
+    
+    def _latest_web_vitals(self) -> WebVitals:
+        """Build WebVitals from the most recent value of each vital."""
+        latest = {}
         
-        # Get latest values for each vital
-        for metric in reversed(self.metrics):
-            if metric.category == "web_vitals":
-                if metric.name == "lcp" and vitals.lcp is None:
-                    vitals.lcp = metric.value
-                elif metric.name == "fid" and vitals.fid is None:
-                    vitals.fid = metric.value
-                elif metric.name == "cls" and vitals.cls is None:
-                    vitals.cls = metric.value
-                elif metric.name == "fcp" and vitals.fcp is None:
-                    vitals.fcp = metric.value
-                elif metric.name == "ttfb" and vitals.ttfb is None:
-                    vitals.ttfb = metric.value
-                elif metric.name == "tti" and vitals.tti is None:
-                    vitals.tti = metric.value
+        # Walk newest-first and stop once every vital has been seen
+        for metric in reversed(self._by_category.get("web_vitals", ())):
+            if metric.name in _WEB_VITAL_NAMES and metric.name not in latest:
+                latest[metric.name] = metric.value
+                if len(latest) == len(_WEB_VITAL_NAMES):
+                    break
         
-        return vitals
+        return WebVitals(**latest)
     
     def get_metrics_by_category(self, category: str) -> List[PerformanceMetric]:
         """Get all metrics for a specific category."""
-        return [m for m in self.metrics if m.category == category]
+        return list(self._by_category.get(category, ()))
     
     def get_metrics_summary(self) -> Dict[str, Any]:
         """Get a summary of all collected metrics."""
-        # Get web vitals synchronously
-        vitals = WebVitals()
-        for metric in reversed(self.metrics):
-            if metric.category == "web_vitals":
-                if metric.name == "lcp" and vitals.lcp is None:
-                    vitals.lcp = metric.value
-                elif metric.name == "fid" and vitals.fid is None:
-                    vitals.fid = metric.value
-                elif metric.name == "cls" and vitals.cls is None:
-                    vitals.cls = metric.value
-                elif metric.name == "fcp" and vitals.fcp is None:
-                    vitals.fcp = metric.value
-                elif metric.name == "ttfb" and vitals.ttfb is None:
-                    vitals.ttfb = metric.value
-                elif metric.name == "tti" and vitals.tti is None:
-                    vitals.tti = metric.value
+        vitals = self._latest_web_vitals()
         
         summary = {
-            "total_metrics": len(self.metrics),
-            "categories": {},
+            "total_metrics": len(self._metrics),
+            "categories": {
+                category: [
+                    {
+                        "name": metric.name,
+                        "value": metric.value,
+                        "unit": metric.unit,
+                        "timestamp": metric.timestamp
+                    }
+                    for metric in category_metrics
+                ]
+                for category, category_metrics in self._by_category.items()
+            },
             "web_vitals": asdict(vitals),
             "duration": time.time() - self.start_time if self.start_time else 0
         }
         
-        # Group by category
-        for metric in self.metrics:
-            if metric.category not in summary["categories"]:
-                summary["categories"][metric.category] = []
-            summary["categories"][metric.category].append({
-                "name": metric.name,
-                "value": metric.value,
-                "unit": metric.unit,
-                "timestamp": metric.timestamp
-            })
-        
         return summary
     
     def analyze_performance(self) -> Dict[str, Any]:
@@ -408,55 +472,23 @@ class PerformanceMonitor:
             "scores": {}
         }
         
-        # Get web vitals synchronously
-        vitals = WebVitals()
-        for metric in reversed(self.metrics):
-            if metric.category == "web_vitals":
-                if metric.name == "lcp" and vitals.lcp is None:
-                    vitals.lcp = metric.value
-                elif metric.name == "fid" and vitals.fid is None:
-                    vitals.fid = metric.value
-                elif metric.name == "cls" and vitals.cls is None:
-                    vitals.cls = metric.value
-                elif metric.name == "fcp" and vitals.fcp is None:
-                    vitals.fcp = metric.value
-                elif metric.name == "ttfb" and vitals.ttfb is None:
-                    vitals.ttfb = metric.value
-                elif metric.name == "tti" and vitals.tti is None:
-                    vitals.tti = metric.value
-        
-        # LCP Analysis (should be < 2.5s for good)
-        if vitals.lcp is not None:
-            if vitals.lcp <= 2500:
-                analysis["scores"]["lcp"] = "good"
-            elif vitals.lcp <= 4000:
-                analysis["scores"]["lcp"] = "needs improvement"
-                analysis["issues"].append(f"LCP is {vitals.lcp}ms (should be < 2500ms)")
-            else:
-                analysis["scores"]["lcp"] = "poor"
-                analysis["issues"].append(f"LCP is {vitals.lcp}ms (critical: should be < 2500ms)")
-        
-        # FID Analysis (should be < 100ms for good)
-        if vitals.fid is not None:
-            if vitals.fid <= 100:
-                analysis["scores"]["fid"] = "good"
-            elif vitals.fid <= 300:
-                analysis["scores"]["fid"] = "needs improvement"
-                analysis["issues"].append(f"FID is {vitals.fid}ms (should be < 100ms)")
-            else:
-                analysis["scores"]["fid"] = "poor"
-                analysis["issues"].append(f"FID is {vitals.fid}ms (critical: should be < 100ms)")
+        vitals = self._latest_web_vitals()
         
-        # CLS Analysis (should be < 0.1 for good)
-        if vitals.cls is not None:
-            if vitals.cls <= 0.1:
-                analysis["scores"]["cls"] = "good"
-            elif vitals.cls <= 0.25:
-                analysis["scores"]["cls"] = "needs improvement"
-                analysis["issues"].append(f"CLS is {vitals.cls} (should be < 0.1)")
+        # Core Web Vitals scoring against the good/poor thresholds
+        for name, label, suffix, good, poor in _VITAL_THRESHOLDS:
+            value = getattr(vitals, name)
+            if value is None:
+                continue
+            if value <= good:
+                analysis["scores"][name] = "good"
+            elif value <= poor:
+                analysis["scores"][name] = "needs improvement"
+                analysis["issues"].append(f"{label} is {value}{suffix} (should be < {good}{suffix})")
             else:
-                analysis["scores"]["cls"] = "poor"
-                analysis["issues"].append(f"CLS is {vitals.cls} (critical: should be < 0.1)")
+                analysis["scores"][name] = "poor"
+                analysis["issues"].append(
+                    f"{label} is {value}{suffix} (critical: should be < {good}{suffix})"
+                )
         
         # Resource analysis
         resource_metrics = self.get_metrics_by_category("resources")
@@ -503,16 +535,24 @@ class PerformanceMonitor:
             for m in self.metrics
         ]
     
+    def export_metrics_json(self) -> bytes:
+        """Export all metrics as a UTF-8 encoded JSON array."""
+        if orjson is not None:
+            return orjson.dumps(list(self._metrics))
+        return json.dumps(self.export_metrics()).encode("utf-8")
+    
     async def cleanup(self) -> None:
         """Clean up monitoring resources."""
         if self.page:
             try:
-                await self.page.evaluate("if (window.__performanceMonitor) { window.__performanceMonitor.cleanup(); }")
+                await self.page.evaluate(_CLEANUP_JS)
             except Exception:
                 pass  # Page might be closed
     
     async def shutdown(self) -> None:
         """Shutdown the performance monitor."""
+        if not self.monitoring_active and self.page is None:
+            return  # Never started or already shut down; nothing to release
         self.monitoring_active = False
         await self.cleanup()
         self.logger.info("Performance monitor shutdown complete")
\ No newline at end of file
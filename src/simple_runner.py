@@ -226,6 +226,14 @@ class SimpleRunner:
         if self.initialized:
             await self.engine.shutdown()
             self.initialized = False
+    
+    async def __aenter__(self):
+        """Async context manager entry; the engine still starts on first use"""
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit"""
+        await self.shutdown()
 
 
 # Convenience functions for direct usage
@@ -13,9 +13,15 @@ from unittest.mock import Mock, AsyncMock, patch
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-# Configure asyncio for Windows
+# Configure asyncio for Windows; elsewhere prefer the faster uvloop when installed
 if sys.platform == "win32":
     asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+else:
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
 
 
 @pytest.fixture
@@ -3,6 +3,7 @@
 import pytest
 import pytest_asyncio
 import asyncio
+import sys
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -370,4 +371,94 @@ class TestErrorDetector:
         assert error_detector._get_http_error_severity(404) == ErrorSeverity.HIGH
         assert error_detector._get_http_error_severity(500) == ErrorSeverity.CRITICAL
         assert error_detector._get_http_error_severity(503) == ErrorSeverity.CRITICAL
-        assert error_detector._get_http_error_severity(301) == ErrorSeverity.MEDIUM
\ No newline at end of file
+        assert error_detector._get_http_error_severity(301) == ErrorSeverity.MEDIUM
+    
+    async def test_page_handlers_record_errors(self, error_detector, mock_page):
+        """Test that registered page handlers record errors from events."""
+        error_detector.set_page(mock_page)
+        handlers = {call[0][0]: call[0][1] for call in mock_page.on.call_args_list}
+        
+        console_msg = MagicMock(type="error", text="Uncaught failure")
+        handlers['console'](console_msg)
+        
+        response = MagicMock(status=503, url="https://example.com/api", status_text="Unavailable")
+        handlers['response'](response)
+        
+        # Events are recorded by the drain task, not inside the listener
+        await error_detector.flush()
+        
+        assert len(error_detector.errors) == 2
+        assert error_detector.errors[0].category == ErrorCategory.CONSOLE
+        assert error_detector.errors[1].severity == ErrorSeverity.CRITICAL
+        
+        await error_detector.cleanup()
+        removed = {call[0][0] for call in mock_page.remove_listener.call_args_list}
+        assert removed == {'console', 'pageerror', 'response', 'requestfailed'}
+        assert mock_page.remove_listener.call_count == 4
+    
+    async def test_deduplicate_repeated_errors(self):
+        """Test folding repeated errors into a single counted entry."""
+        detector = ErrorDetector(deduplicate=True)
+        await detector.initialize()
+        
+        for i in range(5):
+            detector.detect_error(f"NetworkError: Request {i} failed", source="test")
+        detector.detect_error("TimeoutError: Operation timed out", source="test")
+        
+        assert len(detector.errors) == 2
+        assert detector.errors[0].count == 5
+        
+        summary = detector.get_error_summary()
+        assert summary['total_errors'] == 6
+        assert summary['by_category'][ErrorCategory.NETWORK.value] == 5
+        
+        analysis = detector.analyze_errors()
+        assert any('network' in pattern.lower() for pattern in analysis['patterns'])
+        
+        assert detector.export_errors()[0]['count'] == 5
+        
+        detector.clear_errors()
+        detector.detect_error("NetworkError: Request 9 failed", source="test")
+        assert detector.errors[0].count == 1
+    
+    async def test_page_events_recorded_inline_without_loop(self, mock_page):
+        """Test that events are recorded directly when no event loop is running."""
+        detector = ErrorDetector()
+        
+        def set_page_outside_loop():
+            detector.set_page(mock_page)
+        
+        await asyncio.get_running_loop().run_in_executor(None, set_page_outside_loop)
+        handlers = {call[0][0]: call[0][1] for call in mock_page.on.call_args_list}
+        
+        handlers['pageerror']("ReferenceError: x is not defined")
+        
+        assert len(detector.errors) == 1
+        assert detector.errors[0].category == ErrorCategory.JAVASCRIPT
+    
+    async def test_error_timestamp_compatibility(self):
+        """Test that datetime timestamps round-trip through the ns storage."""
+        created = datetime(2024, 1, 2, 3, 4, 5, 123456)
+        error = Error(
+            message="Test error",
+            category=ErrorCategory.UNKNOWN,
+            severity=ErrorSeverity.LOW,
+            timestamp=created,
+            source="test"
+        )
+        
+        assert error.timestamp == created
+        
+        # Without an explicit timestamp the detection time is used
+        before = datetime.now().replace(microsecond=0)
+        detected = Error(message="x", category=ErrorCategory.UNKNOWN, severity=ErrorSeverity.LOW)
+        assert detected.timestamp >= before
+        assert isinstance(detected.timestamp_ns, int)
+    
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="slotted dataclasses need Python 3.10+")
+    async def test_error_is_slotted(self):
+        """Test that Error instances carry no per-instance __dict__."""
+        error = Error(message="x", category=ErrorCategory.UNKNOWN, severity=ErrorSeverity.LOW)
+        
+        assert not hasattr(error, '__dict__')
+        assert error.timestamp is not None
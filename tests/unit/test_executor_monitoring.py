@@ -232,4 +232,42 @@ def test_failing():
             )
             
             # Should have captured the error
-            assert len(execution_result['errors']) > 0 or execution_result.get('test_failed', False)
\ No newline at end of file
+            assert len(execution_result['errors']) > 0 or execution_result.get('test_failed', False)
+    
+    @pytest.mark.asyncio
+    async def test_pytest_workers_reused_across_scripts(self, test_executor, test_config):
+        """Test that consecutive scripts run on the same persistent pytest worker."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            
+            for run in range(2):
+                run_dir = temp_path / f"run_{run}"
+                run_dir.mkdir()
+                script_path = run_dir / "test_reuse.py"
+                script_path.write_text('''
+def test_reuse():
+    assert True
+''')
+                
+                execution_env = {
+                    'enhanced_script_path': str(script_path),
+                    'temp_dir': str(run_dir),
+                    'screenshots_dir': str(run_dir / 'screenshots'),
+                    'logs_dir': str(run_dir / 'logs')
+                }
+                
+                execution_result = {
+                    'script_name': 'test_reuse.py',
+                    'errors': [],
+                    'performance_metrics': {},
+                    'console_logs': []
+                }
+                
+                await test_executor._execute_with_monitoring(
+                    execution_env, execution_result, test_config
+                )
+                
+                assert execution_result.get('pytest_used', False) == True
+            
+            # Both runs were served by a single long-lived worker
+            assert len(test_executor.worker_pool._workers) == 1
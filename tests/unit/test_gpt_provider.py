@@ -4,13 +4,23 @@ Following TDD principles
 """
 
 import pytest
+import asyncio
 import json
 from unittest.mock import Mock, AsyncMock, patch
 
+from ai.providers import gpt_provider
 from ai.providers.gpt_provider import GPTProvider
 from ai.providers.base_provider import TestType, PageAnalysis, TestGenerationRequest
 
 
+@pytest.fixture(autouse=True)
+def clear_client_cache():
+    """Ensure each test builds its client from its own patched AsyncOpenAI"""
+    gpt_provider.clear_client_cache()
+    yield
+    gpt_provider.clear_client_cache()
+
+
 class TestGPTProvider:
     """Test GPT AI Provider implementation"""
     
@@ -155,6 +165,56 @@ class TestGPTProvider:
         assert is_valid is True
         assert len(issues) == 0
     
+    @pytest.mark.asyncio
+    @patch('ai.providers.gpt_provider.AsyncOpenAI')
+    async def test_analyze_pages_concurrently(self, mock_openai_class, mock_env_vars):
+        """Test that multiple pages are analyzed concurrently within the limit"""
+        provider = GPTProvider()
+        
+        in_flight = 0
+        max_in_flight = 0
+        
+        async def fake_analyze(page_content, url):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return url
+        
+        provider.analyze_page = fake_analyze
+        pages = [(f"<html>{i}</html>", f"https://example.com/{i}") for i in range(6)]
+        
+        results = await provider.analyze_pages(pages, concurrency=2)
+        
+        assert results == [url for _, url in pages]
+        assert max_in_flight == 2
+    
+    @pytest.mark.asyncio
+    @patch('ai.providers.gpt_provider.AsyncOpenAI')
+    async def test_client_shared_between_providers(self, mock_openai_class, mock_env_vars):
+        """Test that providers with the same API key share one client"""
+        first = GPTProvider()
+        second = GPTProvider()
+        
+        mock_openai_class.assert_called_once_with(api_key='test-gpt-key')
+        assert first.client is second.client
+    
+    @patch('ai.providers.gpt_provider.AsyncOpenAI')
+    def test_client_not_shared_across_event_loops(self, mock_openai_class, mock_env_vars):
+        """Test that each event loop, and code outside any loop, gets its own client"""
+        mock_openai_class.side_effect = lambda **kwargs: Mock()
+        
+        async def build_client():
+            return GPTProvider().client
+        
+        first = asyncio.run(build_client())
+        second = asyncio.run(build_client())
+        outside_loop = GPTProvider().client
+        
+        assert first is not second
+        assert outside_loop is not first and outside_loop is not second
+    
     def test_extract_code_blocks(self, mock_env_vars):
         """Test code block extraction from GPT responses"""
         with patch('ai.providers.gpt_provider.AsyncOpenAI'):
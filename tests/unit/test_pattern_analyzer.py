@@ -2,10 +2,15 @@
 
 import pytest
 import asyncio
+import copy
+import pickle
+import sys
+from dataclasses import asdict
 from unittest.mock import AsyncMock, MagicMock, patch
+from bs4 import BeautifulSoup
 
 from src.ai.pattern_analyzer import (
-    PatternAnalyzer, PageStructure, Form, FormField,
+    HTML_PARSER, PatternAnalyzer, PageStructure, Form, FormField,
     NavigationElement, InteractiveElement
 )
 
@@ -106,14 +111,34 @@ SAMPLE_COMPLEX_HTML = """
 """
 
 
-@pytest.fixture
+# PageStructures for the immutable SAMPLE_* pages, parsed once per module
+_SAMPLE_STRUCTURES = {}
+
+
+async def analyze_sample(html: str, url: str) -> PageStructure:
+    """Analyze a SAMPLE_* page, reusing the structure from earlier tests."""
+    key = (html, url)
+    if key not in _SAMPLE_STRUCTURES:
+        _SAMPLE_STRUCTURES[key] = await PatternAnalyzer().analyze_page(html, url)
+    return _SAMPLE_STRUCTURES[key]
+
+
+@pytest.fixture(scope="module")
 def pattern_analyzer():
-    """Create a PatternAnalyzer instance."""
+    """Create a PatternAnalyzer instance shared by the module's tests."""
     analyzer = PatternAnalyzer()
     # Note: initialize is called in each test that needs it
     return analyzer
 
 
+@pytest.fixture(autouse=True)
+def reset_analysis_cache(pattern_analyzer):
+    """Start every test with an empty analysis cache on the shared analyzer."""
+    pattern_analyzer._analysis_cache.clear()
+    yield
+    pattern_analyzer._analysis_cache.clear()
+
+
 @pytest.mark.asyncio
 class TestPatternAnalyzer:
     """Test PatternAnalyzer functionality."""
@@ -134,7 +159,7 @@ class TestPatternAnalyzer:
     
     async def test_analyze_login_page(self, pattern_analyzer):
         """Test analyzing a login page."""
-        page_structure = await pattern_analyzer.analyze_page(
+        page_structure = await analyze_sample(
             SAMPLE_LOGIN_HTML,
             "https://example.com/login"
         )
@@ -151,19 +176,19 @@ class TestPatternAnalyzer:
         assert len(form.fields) == 2
         
         # Check fields
-        username_field = next(f for f in form.fields if f.name == "username")
+        username_field = form.fields_by_name["username"]
         assert username_field.field_type == "text"
         assert username_field.label == "Username"
         assert username_field.required
         
-        password_field = next(f for f in form.fields if f.name == "password")
+        password_field = form.fields_by_name["password"]
         assert password_field.field_type == "password"
         assert password_field.required
     
     async def test_analyze_registration_page(self, pattern_analyzer):
         """Test analyzing a registration page."""
         await pattern_analyzer.initialize()
-        page_structure = await pattern_analyzer.analyze_page(
+        page_structure = await analyze_sample(
             SAMPLE_REGISTRATION_HTML,
             "https://example.com/register"
         )
@@ -182,7 +207,7 @@ class TestPatternAnalyzer:
     
     async def test_analyze_search_form(self, pattern_analyzer):
         """Test analyzing a search form."""
-        page_structure = await pattern_analyzer.analyze_page(
+        page_structure = await analyze_sample(
             SAMPLE_SEARCH_HTML,
             "https://example.com"
         )
@@ -196,7 +221,7 @@ class TestPatternAnalyzer:
     
     async def test_analyze_navigation(self, pattern_analyzer):
         """Test navigation analysis."""
-        page_structure = await pattern_analyzer.analyze_page(
+        page_structure = await analyze_sample(
             SAMPLE_COMPLEX_HTML,
             "https://example.com"
         )
@@ -215,7 +240,7 @@ class TestPatternAnalyzer:
     
     async def test_detect_patterns(self, pattern_analyzer):
         """Test UI pattern detection."""
-        page_structure = await pattern_analyzer.analyze_page(
+        page_structure = await analyze_sample(
             SAMPLE_COMPLEX_HTML,
             "https://example.com"
         )
@@ -232,7 +257,7 @@ class TestPatternAnalyzer:
     async def test_find_interactive_elements(self, pattern_analyzer):
         """Test finding interactive elements."""
         await pattern_analyzer.initialize()
-        page_structure = await pattern_analyzer.analyze_page(
+        page_structure = await analyze_sample(
             SAMPLE_COMPLEX_HTML,
             "https://example.com"
         )
@@ -275,21 +300,21 @@ class TestPatternAnalyzer:
         form = page_structure.forms[0]
         
         # Check email field
-        email_field = next(f for f in form.fields if f.name == "email")
+        email_field = form.fields_by_name["email"]
         assert email_field.field_type == "email"
         assert email_field.label == "Email Address"
         assert email_field.required
         assert email_field.autocomplete == "email"
         
         # Check select field
-        country_field = next(f for f in form.fields if f.name == "country")
+        country_field = form.fields_by_name["country"]
         assert country_field.field_type == "select"
         # Empty option might not be included
         assert len(country_field.options) >= 2
         assert "us" in country_field.options
         
         # Check textarea
-        message_field = next(f for f in form.fields if f.name == "message")
+        message_field = form.fields_by_name["message"]
         assert message_field.placeholder == "Your message"
         
         # Check pattern validation
@@ -309,7 +334,7 @@ class TestPatternAnalyzer:
         </div>
         """
         
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, HTML_PARSER)
         
         # ID selector
         btn1 = soup.find('button', id='submit-btn')
@@ -321,9 +346,105 @@ class TestPatternAnalyzer:
         selector3 = pattern_analyzer._generate_selector(btn3)
         assert "data-test" in selector3
     
+    async def test_selector_memo_scoped_to_analysis(self, pattern_analyzer):
+        """Test memoized selectors match uncached ones and don't outlive the parse."""
+        html = """
+        <div>
+            <span role="button"></span>
+            <span role="tab"></span>
+            <span role="switch"></span>
+        </div>
+        """
+        
+        page_structure = await pattern_analyzer.analyze_page(html, "https://example.com")
+        
+        selectors = [e.selector for e in page_structure.interactive_elements]
+        assert selectors == [
+            "span:nth-of-type(1)", "span:nth-of-type(2)", "span:nth-of-type(3)"
+        ]
+        assert pattern_analyzer._selector_cache is None
+        
+        soup = BeautifulSoup(html, HTML_PARSER)
+        uncached = [pattern_analyzer._generate_selector(span) for span in soup.find_all('span')]
+        assert uncached == selectors
+    
+    async def test_analysis_cached_per_content_and_url(self):
+        """Test repeated analysis of the same page reuses the cached structure."""
+        analyzer = PatternAnalyzer()
+        
+        first = await analyzer.analyze_page(SAMPLE_SEARCH_HTML, "https://example.com")
+        again = await analyzer.analyze_page(SAMPLE_SEARCH_HTML, "https://example.com")
+        other_url = await analyzer.analyze_page(SAMPLE_SEARCH_HTML, "https://example.org")
+        
+        assert again is first
+        assert other_url is not first
+        assert other_url.url == "https://example.org"
+        
+        with pytest.raises(AttributeError):
+            first.title = "Changed"
+    
+    async def test_analysis_cache_bounded(self, monkeypatch):
+        """Test the analysis cache evicts the least recently used page."""
+        monkeypatch.setattr("src.ai.pattern_analyzer.ANALYSIS_CACHE_SIZE", 2)
+        analyzer = PatternAnalyzer()
+        
+        for i in range(3):
+            await analyzer.analyze_page(f"<html><title>{i}</title></html>", "https://example.com")
+        
+        assert len(analyzer._analysis_cache) == 2
+    
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10+")
+    async def test_results_are_slotted_and_frozen(self, pattern_analyzer):
+        """Test analysis result dataclasses use slots and reject mutation."""
+        page_structure = await analyze_sample(
+            SAMPLE_LOGIN_HTML,
+            "https://example.com/login"
+        )
+        form = page_structure.forms[0]
+        
+        for obj in (page_structure, form, form.fields[0], page_structure.navigation[0]):
+            assert not hasattr(obj, '__dict__')
+        
+        with pytest.raises(AttributeError):
+            form.method = "get"
+        
+        # Collections are immutable too, so a cached structure cannot be corrupted
+        with pytest.raises(AttributeError):
+            page_structure.forms.append(form)
+        with pytest.raises(AttributeError):
+            form.fields.append(form.fields[0])
+        
+        attributes = {"data-id": "1"}
+        element = InteractiveElement(
+            element_type="button", selector="#save", text="Save",
+            aria_label=None, role=None, attributes=attributes
+        )
+        attributes["data-id"] = "2"
+        assert element.attributes["data-id"] == "1"
+    
+    async def test_results_round_trip(self, pattern_analyzer):
+        """Test analysis results work with asdict, deepcopy and pickle."""
+        page_structure = await analyze_sample(
+            SAMPLE_LOGIN_HTML,
+            "https://example.com/login"
+        )
+        assert page_structure.forms and page_structure.interactive_elements
+        
+        as_dict = asdict(page_structure)
+        form = page_structure.forms[0]
+        assert as_dict["forms"][0]["fields_by_name"].keys() == form.fields_by_name.keys()
+        assert as_dict["interactive_elements"][0]["attributes"] == dict(
+            page_structure.interactive_elements[0].attributes
+        )
+        
+        assert copy.deepcopy(page_structure) == page_structure
+        restored = pickle.loads(pickle.dumps(page_structure))
+        assert restored == page_structure
+        assert restored.forms[0].fields_by_name == form.fields_by_name
+    
     async def test_get_test_scenarios(self, pattern_analyzer):
         """Test test scenario generation."""
-        page_structure = await pattern_analyzer.analyze_page(
+        page_structure = await analyze_sample(
             SAMPLE_LOGIN_HTML,
             "https://example.com/login"
         )
@@ -1,36 +1,93 @@
 """Unit tests for PerformanceMonitor."""
 
 import pytest
-import pytest_asyncio
 import asyncio
-import time
+import json
+import sys
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime
+from collections import defaultdict
+from types import SimpleNamespace
 
 from src.monitoring.performance.performance_monitor import (
-    PerformanceMonitor, PerformanceMetric, WebVitals
+    PerformanceMonitor, PerformanceMetric, WebVitals, _INJECT_JS
 )
 
+# Fixed timestamp for test metrics; they are only compared and exported
+TS = 1_700_000_000.0
+
+# Metrics are frozen, so these can be shared by every test that reads them
+GOOD_METRICS = (
+    PerformanceMetric(
+        name="lcp", value=2000, unit="ms",
+        timestamp=TS, category="web_vitals"
+    ),
+    PerformanceMetric(
+        name="fid", value=80, unit="ms",
+        timestamp=TS, category="web_vitals"
+    ),
+    PerformanceMetric(
+        name="cls", value=0.05, unit="score",
+        timestamp=TS, category="web_vitals"
+    )
+)
+
+POOR_METRICS = (
+    PerformanceMetric(
+        name="lcp", value=5000, unit="ms",
+        timestamp=TS, category="web_vitals"
+    ),
+    PerformanceMetric(
+        name="fid", value=400, unit="ms",
+        timestamp=TS, category="web_vitals"
+    ),
+    PerformanceMetric(
+        name="cls", value=0.3, unit="score",
+        timestamp=TS, category="web_vitals"
+    ),
+    PerformanceMetric(
+        name="total_resources", value=150, unit="count",
+        timestamp=TS, category="resources"
+    ),
+    PerformanceMetric(
+        name="total_resource_size", value=10*1024*1024, unit="bytes",
+        timestamp=TS, category="resources"
+    )
+)
+
+# The tests share one monitor, so keep the module on a single xdist worker
+pytestmark = [pytest.mark.asyncio, pytest.mark.xdist_group("perf_monitor")]
+
 
 @pytest.fixture
 def mock_page():
-    """Create a mock Playwright page."""
-    page = AsyncMock()
-    page.url = "https://example.com"
-    page.evaluate = AsyncMock()
-    return page
+    """Create a minimal stand-in for a Playwright page."""
+    return SimpleNamespace(
+        url="https://example.com",
+        evaluate=AsyncMock(),
+        context=SimpleNamespace(add_init_script=AsyncMock()),
+    )
 
 
-@pytest_asyncio.fixture
-async def performance_monitor():
-    """Create a PerformanceMonitor instance."""
+@pytest.fixture(scope="module")
+def shared_monitor():
+    """Create one PerformanceMonitor for the whole module."""
     monitor = PerformanceMonitor()
-    await monitor.initialize()
     yield monitor
-    await monitor.shutdown()
+    # Only spin up a loop for shutdown when the last test left something to release
+    if monitor.monitoring_active or monitor.page is not None:
+        asyncio.run(monitor.shutdown())
+
+
+@pytest.fixture
+def performance_monitor(shared_monitor):
+    """Provide the shared PerformanceMonitor reset to a freshly initialized state."""
+    shared_monitor.reset()
+    shared_monitor.clear_metric_callbacks()
+    shared_monitor.page = None
+    return shared_monitor
 
 
-@pytest.mark.asyncio
 class TestPerformanceMonitor:
     """Test PerformanceMonitor functionality."""
     
@@ -38,7 +95,7 @@ class TestPerformanceMonitor:
         """Test monitor initialization."""
         monitor = PerformanceMonitor()
         
-        assert monitor.metrics == []
+        assert list(monitor.metrics) == []
         assert monitor.start_time is None
         assert not monitor.monitoring_active
         
@@ -46,7 +103,7 @@ class TestPerformanceMonitor:
         
         assert monitor.start_time is not None
         assert monitor.monitoring_active
-        assert monitor.metrics == []
+        assert list(monitor.metrics) == []
     
     async def test_set_page(self, performance_monitor, mock_page):
         """Test setting the page instance."""
@@ -60,38 +117,46 @@ class TestPerformanceMonitor:
         """Test performance script injection."""
         performance_monitor.set_page(mock_page)
         
+        await performance_monitor._inject_performance_script()
         await performance_monitor._inject_performance_script()
         
-        # Verify script was injected
+        # Verify script was registered once for the context and run on the current page
+        mock_page.context.add_init_script.assert_called_once()
         mock_page.evaluate.assert_called_once()
-        call_args = mock_page.evaluate.call_args[0][0]
+        call_args = mock_page.context.add_init_script.call_args[0][0]
         assert "window.__performanceMonitor" in call_args
         assert "PerformanceObserver" in call_args
         assert "largest-contentful-paint" in call_args
     
+    async def test_injected_script_reads_navigation_timing_lazily(self):
+        """Test navigation timing is read per collection, not when the init script runs."""
+        init_part, get_metrics_part = _INJECT_JS.split("getMetrics:", 1)
+        
+        # At document start these timestamps are still 0
+        for timestamp in ("domContentLoadedEventEnd", "loadEventEnd", "responseStart"):
+            assert timestamp not in init_part
+            assert f"if (timing.{timestamp})" in get_metrics_part
+    
     async def test_collect_metrics(self, performance_monitor, mock_page):
         """Test metric collection."""
-        # Mock client metrics
-        mock_page.evaluate.side_effect = [
-            # First call - client metrics
-            {
+        # Vitals, resources and memory arrive in a single payload
+        mock_page.evaluate.return_value = {
+            'vitals': {
                 'lcp': 2500.0,
                 'fcp': 800.0,
                 'cls': 0.05,
                 'ttfb': 200.0
             },
-            # Second call - resources
-            [
+            'resources': [
                 {'name': 'style.css', 'type': 'css', 'duration': 50, 'size': 1024},
                 {'name': 'script.js', 'type': 'script', 'duration': 100, 'size': 2048}
             ],
-            # Third call - memory
-            {
+            'memory': {
                 'usedJSHeapSize': 10485760,
                 'totalJSHeapSize': 20971520,
                 'jsHeapSizeLimit': 2147483648
             }
-        ]
+        }
         
         performance_monitor.set_page(mock_page)
         
@@ -101,6 +166,7 @@ class TestPerformanceMonitor:
         assert metrics['web_vitals']['fcp'] == 800.0
         assert len(metrics['resources']) == 2
         assert metrics['memory']['usedJSHeapSize'] == 10485760
+        assert mock_page.evaluate.call_count == 1
         
         # Check that metrics were stored
         assert len(performance_monitor.metrics) > 0
@@ -108,19 +174,18 @@ class TestPerformanceMonitor:
     async def test_get_web_vitals(self, performance_monitor):
         """Test getting Core Web Vitals."""
         # Add some metrics
-        timestamp = time.time()
         performance_monitor.metrics = [
             PerformanceMetric(
                 name="lcp", value=2300, unit="ms", 
-                timestamp=timestamp, category="web_vitals"
+                timestamp=TS, category="web_vitals"
             ),
             PerformanceMetric(
                 name="fid", value=50, unit="ms",
-                timestamp=timestamp, category="web_vitals"
+                timestamp=TS, category="web_vitals"
             ),
             PerformanceMetric(
                 name="cls", value=0.08, unit="score",
-                timestamp=timestamp, category="web_vitals"
+                timestamp=TS, category="web_vitals"
             )
         ]
         
@@ -130,70 +195,49 @@ class TestPerformanceMonitor:
         assert vitals.fid == 50
         assert vitals.cls == 0.08
     
-    async def test_analyze_performance_good(self, performance_monitor):
-        """Test performance analysis with good metrics."""
-        # Add good metrics
-        timestamp = time.time()
+    async def test_get_web_vitals_uses_latest_values(self, performance_monitor):
+        """Test that the most recent value of each vital wins."""
         performance_monitor.metrics = [
             PerformanceMetric(
-                name="lcp", value=2000, unit="ms",
-                timestamp=timestamp, category="web_vitals"
-            ),
-            PerformanceMetric(
-                name="fid", value=80, unit="ms",
-                timestamp=timestamp, category="web_vitals"
-            ),
-            PerformanceMetric(
-                name="cls", value=0.05, unit="score",
-                timestamp=timestamp, category="web_vitals"
+                name=name, value=value, unit="ms",
+                timestamp=index, category="web_vitals"
             )
+            for index, (name, value) in enumerate([
+                ("lcp", 4000), ("fid", 300), ("lcp", 2100), ("ttfb", 150)
+            ])
         ]
         
-        analysis = performance_monitor.analyze_performance()
+        vitals = await performance_monitor.get_web_vitals()
         
-        assert analysis['status'] == 'good'
-        assert analysis['scores']['lcp'] == 'good'
-        assert analysis['scores']['fid'] == 'good'
-        assert analysis['scores']['cls'] == 'good'
-        assert len(analysis['issues']) == 0
+        assert vitals.lcp == 2100
+        assert vitals.fid == 300
+        assert vitals.ttfb == 150
+        assert vitals.cls is None
+        assert performance_monitor.analyze_performance()['scores']['lcp'] == 'good'
     
-    async def test_analyze_performance_poor(self, performance_monitor):
-        """Test performance analysis with poor metrics."""
-        # Add poor metrics
-        timestamp = time.time()
-        performance_monitor.metrics = [
-            PerformanceMetric(
-                name="lcp", value=5000, unit="ms",
-                timestamp=timestamp, category="web_vitals"
-            ),
-            PerformanceMetric(
-                name="fid", value=400, unit="ms",
-                timestamp=timestamp, category="web_vitals"
-            ),
-            PerformanceMetric(
-                name="cls", value=0.3, unit="score",
-                timestamp=timestamp, category="web_vitals"
-            ),
-            PerformanceMetric(
-                name="total_resources", value=150, unit="count",
-                timestamp=timestamp, category="resources"
-            ),
-            PerformanceMetric(
-                name="total_resource_size", value=10*1024*1024, unit="bytes",
-                timestamp=timestamp, category="resources"
-            )
-        ]
+    @pytest.mark.parametrize(
+        "metrics,expected_status,issue_count,issue_keywords,has_recommendations",
+        [
+            (GOOD_METRICS, 'good', range(0, 1), (), False),
+            (POOR_METRICS, 'poor', range(4, 100), ('LCP', 'resources'), True)
+        ],
+        ids=['good', 'poor']
+    )
+    async def test_analyze_performance(self, performance_monitor, metrics, expected_status,
+                                       issue_count, issue_keywords, has_recommendations):
+        """Test performance analysis for good and poor metrics."""
+        performance_monitor.metrics = list(metrics)
         
         analysis = performance_monitor.analyze_performance()
         
-        assert analysis['status'] == 'poor'
-        assert analysis['scores']['lcp'] == 'poor'
-        assert analysis['scores']['fid'] == 'poor'
-        assert analysis['scores']['cls'] == 'poor'
-        assert len(analysis['issues']) > 3
-        assert any('LCP' in issue for issue in analysis['issues'])
-        assert any('resources' in issue for issue in analysis['issues'])
-        assert len(analysis['recommendations']) > 0
+        assert analysis['status'] == expected_status
+        assert analysis['scores']['lcp'] == expected_status
+        assert analysis['scores']['fid'] == expected_status
+        assert analysis['scores']['cls'] == expected_status
+        assert len(analysis['issues']) in issue_count
+        for keyword in issue_keywords:
+            assert any(keyword in issue for issue in analysis['issues'])
+        assert bool(analysis['recommendations']) == has_recommendations
     
     async def test_metric_callbacks(self, performance_monitor):
         """Test metric callback functionality."""
@@ -210,28 +254,69 @@ class TestPerformanceMonitor:
         # Add a metric
         metric = PerformanceMetric(
             name="test_metric", value=100, unit="ms",
-            timestamp=time.time(), category="test"
+            timestamp=TS, category="test"
         )
         performance_monitor._add_metric(metric)
         
         assert callback_called
         assert metric_received == metric
     
+    async def test_initialize_keeps_metric_callbacks(self, performance_monitor):
+        """Test callbacks registered before initialize still fire afterwards."""
+        received = []
+        performance_monitor.register_metric_callback('test_metric', received.append)
+        
+        await performance_monitor.initialize()
+        metric = PerformanceMetric(
+            name="test_metric", value=100, unit="ms",
+            timestamp=TS, category="test"
+        )
+        performance_monitor._add_metric(metric)
+        
+        assert received == [metric]
+    
+    async def test_callback_dispatch_is_single_lookup(self, performance_monitor, monkeypatch):
+        """Test that dispatch looks up one metric's callbacks without scanning the rest."""
+        class RecordingCallbacks(defaultdict):
+            def __init__(self):
+                super().__init__(list)
+                self.lookups = []
+            
+            def get(self, key, default=None):
+                self.lookups.append(key)
+                return super().get(key, default)
+            
+            def __iter__(self):
+                raise AssertionError("callback dispatch must not scan every registration")
+        
+        callbacks = RecordingCallbacks()
+        monkeypatch.setattr(performance_monitor, '_metric_callbacks', callbacks)
+        for _ in range(1_000):
+            performance_monitor.register_metric_callback('other_metric', lambda metric: None)
+        metric = PerformanceMetric(
+            name="test_metric", value=100, unit="ms",
+            timestamp=TS, category="test"
+        )
+        
+        performance_monitor._add_metric(metric)
+        
+        assert callbacks.lookups == ['test_metric']
+        assert 'test_metric' not in callbacks
+    
     async def test_get_metrics_by_category(self, performance_monitor):
         """Test getting metrics by category."""
-        timestamp = time.time()
         performance_monitor.metrics = [
             PerformanceMetric(
                 name="lcp", value=2000, unit="ms",
-                timestamp=timestamp, category="web_vitals"
+                timestamp=TS, category="web_vitals"
             ),
             PerformanceMetric(
                 name="fcp", value=800, unit="ms",
-                timestamp=timestamp, category="web_vitals"
+                timestamp=TS, category="web_vitals"
             ),
             PerformanceMetric(
                 name="total_resources", value=50, unit="count",
-                timestamp=timestamp, category="resources"
+                timestamp=TS, category="resources"
             )
         ]
         
@@ -243,13 +328,44 @@ class TestPerformanceMonitor:
         assert all(m.category == "web_vitals" for m in web_vitals)
         assert all(m.category == "resources" for m in resources)
     
+    async def test_metric_memory_footprint(self):
+        """Test metrics are slotted, compact and immutable."""
+        metric = PerformanceMetric(
+            name="lcp", value=2000, unit="ms",
+            timestamp=TS, category="web_vitals"
+        )
+        
+        if sys.version_info >= (3, 10):
+            assert not hasattr(metric, '__dict__')
+        assert sys.getsizeof(metric) < 128
+        
+        with pytest.raises(AttributeError):
+            metric.value = 0
+    
+    async def test_metrics_history_bounded(self, monkeypatch):
+        """Test old metrics are evicted from the history and category index."""
+        monkeypatch.setattr(
+            'src.monitoring.performance.performance_monitor.METRICS_HISTORY_SIZE', 3
+        )
+        monitor = PerformanceMonitor()
+        
+        for index, category in enumerate(["web_vitals", "resources", "web_vitals", "memory"]):
+            monitor._add_metric(PerformanceMetric(
+                name=f"metric_{index}", value=index, unit="ms",
+                timestamp=index, category=category
+            ))
+        
+        assert [m.name for m in monitor.metrics] == ["metric_1", "metric_2", "metric_3"]
+        assert [m.name for m in monitor.get_metrics_by_category("web_vitals")] == ["metric_2"]
+        assert len(monitor.get_metrics_by_category("resources")) == 1
+        assert monitor.get_metrics_summary()['total_metrics'] == 3
+    
     async def test_export_metrics(self, performance_monitor):
         """Test metric export."""
-        timestamp = time.time()
         performance_monitor.metrics = [
             PerformanceMetric(
                 name="test_metric", value=123, unit="ms",
-                timestamp=timestamp, category="test",
+                timestamp=TS, category="test",
                 metadata={"extra": "data"}
             )
         ]
@@ -262,22 +378,48 @@ class TestPerformanceMonitor:
         assert exported[0]['unit'] == 'ms'
         assert exported[0]['metadata']['extra'] == 'data'
     
+    async def test_export_metrics_json(self, performance_monitor):
+        """Test JSON export matches the dictionary export."""
+        performance_monitor.metrics = [
+            PerformanceMetric(
+                name="test_metric", value=123, unit="ms",
+                timestamp=TS, category="test",
+                metadata={"extra": "data"}
+            ),
+            PerformanceMetric(
+                name="lcp", value=2000.5, unit="ms",
+                timestamp=TS, category="web_vitals"
+            )
+        ]
+        
+        exported = performance_monitor.export_metrics_json()
+        
+        assert isinstance(exported, bytes)
+        assert json.loads(exported) == performance_monitor.export_metrics()
+    
     async def test_periodic_collection(self, performance_monitor, mock_page):
         """Test periodic metric collection."""
-        mock_page.evaluate.return_value = {'lcp': 2000}
+        collected = asyncio.Event()
+        mock_page.evaluate.return_value = {
+            'vitals': {'lcp': 2000},
+            'resources': [],
+            'memory': None
+        }
         performance_monitor.set_page(mock_page)
+        performance_monitor.register_metric_callback('lcp', lambda metric: collected.set())
         
         # Start monitoring
         await performance_monitor.start_monitoring()
         
-        # Wait a bit for collection
-        await asyncio.sleep(0.1)
+        # Wait for the background task to store its first metric
+        await asyncio.wait_for(collected.wait(), timeout=1.0)
         
         # Stop monitoring
         await performance_monitor.stop_monitoring()
         
-        # Should have called evaluate at least once
-        assert mock_page.evaluate.call_count >= 1
+        lcp = [m for m in performance_monitor.metrics if m.name == 'lcp']
+        assert lcp and lcp[0].value == 2000
+        assert lcp[0].category == "web_vitals"
     
     async def test_cleanup(self, performance_monitor, mock_page):
         """Test cleanup functionality."""
@@ -299,17 +441,26 @@ class TestPerformanceMonitor:
         
         assert not performance_monitor.monitoring_active
     
+    async def test_shutdown_idle_monitor_is_noop(self):
+        """Test shutting down a monitor that was never started skips cleanup."""
+        monitor = PerformanceMonitor()
+        
+        with patch.object(monitor, 'cleanup', AsyncMock()) as cleanup:
+            await monitor.shutdown()
+        
+        cleanup.assert_not_called()
+        assert not monitor.monitoring_active
+    
     async def test_get_metrics_summary(self, performance_monitor):
         """Test getting metrics summary."""
-        timestamp = time.time()
         performance_monitor.metrics = [
             PerformanceMetric(
                 name="lcp", value=2000, unit="ms",
-                timestamp=timestamp, category="web_vitals"
+                timestamp=TS, category="web_vitals"
             ),
             PerformanceMetric(
                 name="total_resources", value=50, unit="count",
-                timestamp=timestamp, category="resources"
+                timestamp=TS, category="resources"
             )
         ]
         
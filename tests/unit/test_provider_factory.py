@@ -4,41 +4,84 @@ Following TDD principles
 """
 
 import pytest
-import os
+import subprocess
+import sys
+from pathlib import Path
 from unittest.mock import patch, Mock
 
+from ai.providers.base_provider import BaseAIProvider
 from ai.providers.provider_factory import AIProviderFactory, AIProviderType
 from ai.providers.claude_provider import ClaudeProvider
 from ai.providers.gemini_provider import GeminiProvider
 from ai.providers.gpt_provider import GPTProvider
 
 
+# SDK client constructors replaced so providers can be built without API access
+_SDK_PATCH_TARGETS = (
+    'ai.providers.claude_provider.AsyncAnthropic',
+    'ai.providers.gemini_provider.genai',
+    'ai.providers.gpt_provider.AsyncOpenAI'
+)
+
+
+@pytest.fixture
+def provider_env(monkeypatch):
+    """Point AIProviderFactory at an isolated set of API keys"""
+    def set_keys(**keys):
+        monkeypatch.setattr(AIProviderFactory, '_env', keys)
+    return set_keys
+
+
+@pytest.fixture(scope="class")
+def patched_sdks():
+    """Patch the provider SDKs once for the whole test class"""
+    patchers = [patch(target) for target in _SDK_PATCH_TARGETS]
+    for patcher in patchers:
+        patcher.start()
+    yield
+    for patcher in reversed(patchers):
+        patcher.stop()
+
+
+@pytest.mark.usefixtures("patched_sdks")
 class TestAIProviderFactory:
     """Test AI Provider Factory"""
     
     def test_create_claude_provider(self, mock_env_vars):
         """Test creating Claude provider"""
-        with patch('ai.providers.claude_provider.AsyncAnthropic'):
-            provider = AIProviderFactory.create_provider(AIProviderType.CLAUDE)
-            assert isinstance(provider, ClaudeProvider)
+        provider = AIProviderFactory.create_provider(AIProviderType.CLAUDE)
+        assert isinstance(provider, ClaudeProvider)
     
     def test_create_gemini_provider(self, mock_env_vars):
         """Test creating Gemini provider"""
-        with patch('ai.providers.gemini_provider.genai'):
-            provider = AIProviderFactory.create_provider(AIProviderType.GEMINI)
-            assert isinstance(provider, GeminiProvider)
+        provider = AIProviderFactory.create_provider(AIProviderType.GEMINI)
+        assert isinstance(provider, GeminiProvider)
     
     def test_create_gpt_provider(self, mock_env_vars):
         """Test creating GPT provider"""
-        with patch('ai.providers.gpt_provider.AsyncOpenAI'):
-            provider = AIProviderFactory.create_provider(AIProviderType.GPT)
-            assert isinstance(provider, GPTProvider)
+        provider = AIProviderFactory.create_provider(AIProviderType.GPT)
+        assert isinstance(provider, GPTProvider)
     
     def test_create_invalid_provider(self):
         """Test creating provider with invalid type"""
         with pytest.raises(ValueError):
             AIProviderFactory.create_provider("invalid_provider")
     
+    def test_create_provider_from_string(self, mock_env_vars):
+        """Test provider types can be given as their string values"""
+        provider = AIProviderFactory.create_provider("gpt")
+        assert isinstance(provider, GPTProvider)
+    
+    def test_registry_is_dict_lookup(self):
+        """Test loaded providers are registered in a type-keyed dict"""
+        AIProviderFactory._load_providers()
+        
+        assert isinstance(AIProviderFactory._providers, dict)
+        assert AIProviderFactory._providers[AIProviderType.CLAUDE] is ClaudeProvider
+        for provider_type, provider_class in AIProviderFactory._providers.items():
+            assert isinstance(provider_type, AIProviderType)
+            assert issubclass(provider_class, BaseAIProvider)
+    
     def test_get_available_providers_all_configured(self, mock_env_vars):
         """Test checking available providers when all are configured"""
         availability = AIProviderFactory.get_available_providers()
@@ -47,46 +90,46 @@ class TestAIProviderFactory:
         assert availability['gemini'] is True
         assert availability['gpt'] is True
     
-    def test_get_available_providers_none_configured(self):
+    def test_get_available_providers_none_configured(self, provider_env):
         """Test checking available providers when none are configured"""
-        with patch.dict(os.environ, {}, clear=True):
-            availability = AIProviderFactory.get_available_providers()
-            
-            assert availability['claude'] is False
-            assert availability['gemini'] is False
-            assert availability['gpt'] is False
+        provider_env()
+        availability = AIProviderFactory.get_available_providers()
+        
+        assert availability['claude'] is False
+        assert availability['gemini'] is False
+        assert availability['gpt'] is False
     
-    def test_get_available_providers_partial_configured(self):
+    def test_get_available_providers_partial_configured(self, provider_env):
         """Test checking available providers with partial configuration"""
-        with patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'}, clear=True):
-            availability = AIProviderFactory.get_available_providers()
-            
-            assert availability['claude'] is False
-            assert availability['gemini'] is False
-            assert availability['gpt'] is True
+        provider_env(OPENAI_API_KEY='test-key')
+        availability = AIProviderFactory.get_available_providers()
+        
+        assert availability['claude'] is False
+        assert availability['gemini'] is False
+        assert availability['gpt'] is True
     
     def test_get_default_provider_claude_priority(self, mock_env_vars):
         """Test default provider selection with Claude priority"""
         default = AIProviderFactory.get_default_provider()
         assert default == AIProviderType.CLAUDE
     
-    def test_get_default_provider_gpt_fallback(self):
+    def test_get_default_provider_gpt_fallback(self, provider_env):
         """Test default provider falls back to GPT when Claude unavailable"""
-        with patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'}, clear=True):
-            default = AIProviderFactory.get_default_provider()
-            assert default == AIProviderType.GPT
+        provider_env(OPENAI_API_KEY='test-key')
+        default = AIProviderFactory.get_default_provider()
+        assert default == AIProviderType.GPT
     
-    def test_get_default_provider_gemini_last_resort(self):
+    def test_get_default_provider_gemini_last_resort(self, provider_env):
         """Test default provider falls back to Gemini as last option"""
-        with patch.dict(os.environ, {'GOOGLE_API_KEY': 'test-key'}, clear=True):
-            default = AIProviderFactory.get_default_provider()
-            assert default == AIProviderType.GEMINI
+        provider_env(GOOGLE_API_KEY='test-key')
+        default = AIProviderFactory.get_default_provider()
+        assert default == AIProviderType.GEMINI
     
-    def test_get_default_provider_none_available(self):
+    def test_get_default_provider_none_available(self, provider_env):
         """Test default provider returns None when none available"""
-        with patch.dict(os.environ, {}, clear=True):
-            default = AIProviderFactory.get_default_provider()
-            assert default is None
+        provider_env()
+        default = AIProviderFactory.get_default_provider()
+        assert default is None
     
     def test_create_provider_with_custom_config(self, mock_env_vars, tmp_path):
         """Test creating provider with custom configuration"""
@@ -94,9 +137,22 @@ class TestAIProviderFactory:
         config_file = tmp_path / "custom_config.yaml"
         config_file.write_text("test: config")
         
-        with patch('ai.providers.claude_provider.AsyncAnthropic'):
-            provider = AIProviderFactory.create_provider(
-                AIProviderType.CLAUDE,
-                str(config_file)
-            )
-            assert isinstance(provider, ClaudeProvider)
\ No newline at end of file
+        provider = AIProviderFactory.create_provider(
+            AIProviderType.CLAUDE,
+            str(config_file)
+        )
+        assert isinstance(provider, ClaudeProvider)
+    
+    def test_provider_modules_defer_sdk_imports(self):
+        """Test importing the providers package does not import any SDK"""
+        src_dir = Path(__file__).resolve().parents[2] / 'src'
+        code = (
+            "import sys, ai.providers; "
+            "print(sorted(m for m in ('anthropic', 'openai', 'google.generativeai') "
+            "if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code], cwd=src_dir,
+            capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == '[]'
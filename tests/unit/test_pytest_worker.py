@@ -0,0 +1,68 @@
+"""
+Unit tests for the persistent pytest worker pool
+"""
+
+import pytest
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from core.executor.pytest_worker import PytestWorkerPool
+
+
+class TestPytestWorkerPool:
+    """Test running pytest jobs on persistent workers"""
+    
+    @pytest.mark.asyncio
+    async def test_large_output_survives_reply(self, tmp_path):
+        """Test replies larger than asyncio's default stream limit are read whole."""
+        script_path = tmp_path / "test_loud.py"
+        script_path.write_text('''
+def test_loud():
+    print("x" * 200_000)
+''')
+        
+        pool = PytestWorkerPool(size=1)
+        try:
+            result = await pool.run(
+                [str(script_path), '-s', '-q', '-p', 'no:cacheprovider'],
+                timeout=60
+            )
+            
+            assert result['returncode'] == 0
+            assert "x" * 200_000 in result['stdout']
+            assert pool._workers[0].alive
+        finally:
+            await pool.close()
+    
+    @pytest.mark.asyncio
+    async def test_same_named_scripts_do_not_share_modules(self, tmp_path):
+        """Test a worker runs each job's own script even when names repeat."""
+        outcomes = {'first': "'FIRST' == 'FIRST'", 'second': "'SECOND' == 'FIRST'"}
+        pool = PytestWorkerPool(size=1)
+        try:
+            results = {}
+            for job, assertion in outcomes.items():
+                job_dir = tmp_path / job
+                job_dir.mkdir()
+                (job_dir / "conftest.py").write_text(f"JOB = {job!r}\n")
+                script_path = job_dir / "enhanced_script.py"
+                script_path.write_text(f"def test_script():\n    assert {assertion}\n")
+                results[job] = await pool.run(
+                    [
+                        '-p', 'no:cacheprovider', '-q',
+                        '-c', os.devnull,
+                        '--import-mode=importlib',
+                        '--rootdir=' + str(job_dir),
+                        str(script_path)
+                    ],
+                    timeout=60
+                )
+            
+            assert results['first']['returncode'] == 0
+            assert results['second']['returncode'] == 1
+            assert len(pool._workers) == 1
+        finally:
+            await pool.close()
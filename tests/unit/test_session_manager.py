@@ -4,7 +4,9 @@ Unit tests for SessionManager
 
 import pytest
 import asyncio
+import copy
 import json
+import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
@@ -13,50 +15,84 @@ from playwright.async_api import BrowserContext, Page
 from core.session.session_manager import SessionManager, SessionData
 
 
-@pytest.fixture
-async def session_manager():
-    """Create a SessionManager instance for testing."""
-    manager = SessionManager(session_timeout_minutes=30)
-    await manager.initialize()
-    yield manager
-    # Cleanup
-    if manager.sessions_dir.exists():
-        import shutil
-        shutil.rmtree(manager.sessions_dir, ignore_errors=True)
+@pytest.fixture(scope="module")
+def shared_session_manager(tmp_path_factory):
+    """Create one initialized SessionManager for the whole module."""
+    manager = SessionManager(
+        session_timeout_minutes=30,
+        sessions_dir=tmp_path_factory.mktemp("sessions")
+    )
+    asyncio.run(manager.initialize())
+    return manager
 
 
 @pytest.fixture
-def mock_browser_context():
-    """Create a mock browser context."""
-    context = AsyncMock(spec=BrowserContext)
-    context.cookies = AsyncMock(return_value=[
+def session_manager(shared_session_manager):
+    """Hand out the shared SessionManager with no cached or persisted sessions."""
+    shared_session_manager.active_sessions.clear()
+    for session_file in shared_session_manager.sessions_dir.glob("*.json"):
+        session_file.unlink()
+    return shared_session_manager
+
+
+def _prime_context(context):
+    """Give the shared browser context its default per-test behaviour."""
+    context.cookies.return_value = [
         {'name': 'session_id', 'value': 'test123', 'domain': 'example.com'},
         {'name': 'auth_token', 'value': 'abc456', 'domain': 'example.com'}
-    ])
+    ]
+
+
+def _prime_page(page):
+    """Give the shared page its default per-test behaviour."""
+    page.url = 'https://example.com/dashboard'
+    page.evaluate.return_value = {
+        'user_id': '12345',
+        'auth_token': 'stored_token'
+    }
+
+
+@pytest.fixture(scope="module")
+def shared_browser_context():
+    """Create one mock browser context for the whole module."""
+    context = AsyncMock(spec=BrowserContext)
+    context.cookies = AsyncMock()
     context.add_cookies = AsyncMock()
     context.new_page = AsyncMock()
     return context
 
 
-@pytest.fixture
-def mock_page():
-    """Create a mock page."""
+@pytest.fixture(scope="module")
+def shared_page():
+    """Create one mock page for the whole module."""
     page = AsyncMock(spec=Page)
     page.goto = AsyncMock()
-    page.url = 'https://example.com/dashboard'
     page.locator = MagicMock()
-    page.evaluate = AsyncMock(return_value={
-        'user_id': '12345',
-        'auth_token': 'stored_token'
-    })
+    page.evaluate = AsyncMock()
     page.wait_for_load_state = AsyncMock()
     page.close = AsyncMock()
     return page
 
 
 @pytest.fixture
-def sample_session_data():
-    """Create sample session data."""
+def mock_browser_context(shared_browser_context):
+    """Hand out the shared browser context, reset after each test."""
+    _prime_context(shared_browser_context)
+    yield shared_browser_context
+    shared_browser_context.reset_mock(return_value=True, side_effect=True)
+
+
+@pytest.fixture
+def mock_page(shared_page):
+    """Hand out the shared page, reset after each test."""
+    _prime_page(shared_page)
+    yield shared_page
+    shared_page.reset_mock(return_value=True, side_effect=True)
+
+
+@pytest.fixture(scope="module")
+def sample_session_template():
+    """Create the sample session data once for the whole module."""
     return SessionData(
         session_id='test_session_123',
         url='https://example.com',
@@ -74,6 +110,12 @@ def sample_session_data():
     )
 
 
+@pytest.fixture
+def sample_session_data(sample_session_template):
+    """Hand out a shallow copy of the sample session data; containers are shared."""
+    return copy.copy(sample_session_template)
+
+
 class TestSessionData:
     """Test SessionData class functionality."""
     
@@ -85,6 +127,17 @@ class TestSessionData:
         # Expired
         sample_session_data.expires_at = datetime.now() - timedelta(minutes=1)
         assert sample_session_data.is_expired()
+        
+        # Checked against a caller-supplied clock
+        assert not sample_session_data.is_expired(
+            sample_session_data.expires_at - timedelta(seconds=1)
+        )
+    
+    def test_slots(self, sample_session_data):
+        """Test session data instances carry no per-instance __dict__."""
+        if sys.version_info < (3, 10):
+            pytest.skip("dataclass slots need Python 3.10+")
+        assert not hasattr(sample_session_data, '__dict__')
     
     def test_to_dict(self, sample_session_data):
         """Test conversion to dictionary."""
@@ -120,14 +173,14 @@ class TestSessionData:
 class TestSessionManager:
     """Test SessionManager functionality."""
     
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_initialize(self, session_manager):
         """Test session manager initialization."""
         assert session_manager.sessions_dir.exists()
         assert session_manager.session_timeout == timedelta(minutes=30)
         assert session_manager.persist_sessions is True
     
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_generate_session_key(self, session_manager):
         """Test session key generation."""
         key = session_manager._generate_session_key(
@@ -142,8 +195,13 @@ class TestSessionManager:
             'user@email.com'
         )
         assert key == 'example_com_8080_user@email.com'
+        
+        # Repeated lookups are served from the cache
+        hits = SessionManager._generate_session_key.cache_info().hits
+        session_manager._generate_session_key('https://example.com/app', 'testuser')
+        assert SessionManager._generate_session_key.cache_info().hits == hits + 1
     
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_get_or_create_session_new(
         self,
         session_manager,
@@ -170,7 +228,7 @@ class TestSessionManager:
         mock_browser_context.new_page.assert_called()
         mock_page.goto.assert_called()
     
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_get_or_create_session_existing(
         self,
         session_manager,
@@ -197,7 +255,7 @@ class TestSessionManager:
         assert session.session_id == sample_session_data.session_id
         mock_browser_context.add_cookies.assert_called_once()
     
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_inject_auth_steps(self, session_manager, sample_session_data):
         """Test injecting authentication steps into test code."""
         original_code = """
@@ -227,7 +285,7 @@ async def test_navigation():
         assert 'Restore authentication session' in modified_code
         assert json.dumps(sample_session_data.cookies) in modified_code
     
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_inject_auth_steps_login_test(
         self,
         session_manager,
@@ -249,7 +307,7 @@ async def test_login():
         # Login tests should not be modified
         assert modified_code == login_code
     
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_session_persistence(self, session_manager, sample_session_data):
         """Test saving and loading sessions from disk."""
         # Save session
@@ -266,7 +324,7 @@ async def test_login():
         assert loaded_session.session_id == sample_session_data.session_id
         assert loaded_session.username == sample_session_data.username
     
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_cleanup_expired_sessions(self, session_manager):
         """Test cleanup of expired sessions."""
         # Create expired session
@@ -302,8 +360,10 @@ async def test_login():
         session_manager.active_sessions['valid_key'] = valid_session
         
         # Persist both
-        await session_manager._persist_session(expired_session)
-        await session_manager._persist_session(valid_session)
+        await asyncio.gather(
+            session_manager._persist_session(expired_session),
+            session_manager._persist_session(valid_session)
+        )
         
         # Run cleanup
         await session_manager._cleanup_expired_sessions()
@@ -312,7 +372,7 @@ async def test_login():
         assert 'expired_key' not in session_manager.active_sessions
         assert 'valid_key' in session_manager.active_sessions
     
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_invalidate_session(self, session_manager, sample_session_data):
         """Test session invalidation."""
         # Add session
@@ -336,7 +396,7 @@ async def test_login():
         session_file = session_manager.sessions_dir / f"{session_key}.json"
         assert not session_file.exists()
     
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_extract_auth_tokens(self, session_manager):
         """Test extraction of auth tokens from cookies and storage."""
         cookies = [
@@ -361,7 +421,7 @@ async def test_login():
         assert 'cookie_regular_cookie' not in tokens
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_standard_login_detection(session_manager, mock_page):
     """Test standard login form detection and execution."""
     # Setup mock locators
@@ -381,15 +441,22 @@ async def test_standard_login_detection(session_manager, mock_page):
     submit_locator.first = MagicMock()
     submit_locator.first.click = AsyncMock()
     
-    # Configure page.locator to return appropriate mocks
+    missing_locator = MagicMock(count=AsyncMock(return_value=0))
+    
+    # Configure page.locator to return appropriate mocks; first keyword match wins
+    locators = {
+        'email': username_locator,
+        'text': username_locator,
+        'password': password_locator,
+        'submit': submit_locator,
+        'button': submit_locator,
+    }
+    
     def locator_side_effect(selector):
-        if 'email' in selector or 'text' in selector:
-            return username_locator
-        elif 'password' in selector:
-            return password_locator
-        elif 'submit' in selector or 'button' in selector:
-            return submit_locator
-        return MagicMock(count=AsyncMock(return_value=0))
+        return next(
+            (locator for keyword, locator in locators.items() if keyword in selector),
+            missing_locator
+        )
     
     mock_page.locator.side_effect = locator_side_effect
     mock_page.url = 'https://example.com/dashboard'  # Changed after login
@@ -5,16 +5,13 @@ Demonstrates both one-line execution and two-part workflows.
 
 import asyncio
 import json
+import os
 from pathlib import Path
-from src.simple_runner import (
-    run_test_suite,
-    generate_test_scripts,
-    execute_test_scripts,
-    SimpleRunner
-)
+from statistics import fmean
+from src.simple_runner import SimpleRunner
 
 
-async def example_one_line_execution():
+async def example_one_line_execution(runner: SimpleRunner):
     """
     Example 1: One-line execution - Complete test suite in a single call.
     This is the simplest way to run comprehensive tests.
@@ -23,7 +20,7 @@ async def example_one_line_execution():
     
     try:
         # Execute complete test suite in one call
-        results = await run_test_suite(
+        results = await runner.run_one_line(
             url="https://demo.playwright.dev/todomvc",
             username="demo_user",  # Not needed for this demo site
             password="demo_pass",  # Not needed for this demo site
@@ -49,7 +46,7 @@ async def example_one_line_execution():
         print(f"❌ One-line execution failed: {str(e)}")
 
 
-async def example_two_part_execution():
+async def example_two_part_execution(runner: SimpleRunner):
     """
     Example 2: Two-part execution - Generate scripts first, then execute them.
     This approach allows for script inspection and modification between phases.
@@ -60,7 +57,7 @@ async def example_two_part_execution():
         # Phase 1: Generate test scripts
         print("📝 Phase 1: Generating test scripts...")
         
-        scripts_path = await generate_test_scripts(
+        scripts_path = await runner.generate_scripts(
             url="https://demo.playwright.dev/todomvc",
             username="demo_user",
             password="demo_pass",
@@ -75,16 +72,16 @@ async def example_two_part_execution():
         
         # List generated files
         scripts_dir = Path(scripts_path)
-        script_files = list(scripts_dir.glob("*.py"))
+        with os.scandir(scripts_dir) as entries:
+            script_files = [entry.name for entry in entries if entry.name.endswith(".py")]
         print(f"📄 Generated {len(script_files)} script files:")
         for script_file in script_files:
-            print(f"  - {script_file.name}")
+            print(f"  - {script_file}")
         
         # Show manifest
         manifest_file = scripts_dir / "script_manifest.json"
         if manifest_file.exists():
-            with open(manifest_file, 'r') as f:
-                manifest = json.load(f)
+            manifest = json.loads(manifest_file.read_bytes())
             print(f"\n📋 Script Manifest:")
             for script_info in manifest:
                 print(f"  - {script_info['filename']}: {script_info['description']}")
@@ -99,7 +96,7 @@ async def example_two_part_execution():
             "concurrent_users": 2   # Run with multiple concurrent users
         }
         
-        results = await execute_test_scripts(scripts_path, execution_config)
+        results = await runner.execute_scripts(scripts_path, execution_config)
         
         print(f"✅ Execution completed!")
         print(f"Session ID: {results['session_id']}")
@@ -110,10 +107,10 @@ async def example_two_part_execution():
             print(f"\n📊 Performance Summary:")
             for script_name, metrics in results['performance_metrics'].items():
                 if 'page_load_times' in metrics and metrics['page_load_times']:
-                    avg_load_time = sum(
-                        m['metrics'].get('load_complete', 0) 
+                    avg_load_time = fmean(
+                        m['metrics'].get('load_complete', 0)
                         for m in metrics['page_load_times']
-                    ) / len(metrics['page_load_times'])
+                    )
                     print(f"  - {script_name}: Avg load time {avg_load_time:.2f}ms")
         
     except Exception as e:
@@ -132,15 +129,17 @@ async def main():
         ("Two-Part Execution", example_two_part_execution)
     ]
     
-    for example_name, example_func in examples:
-        try:
-            print(f"\n🎯 Running {example_name}...")
-            await example_func()
-            print(f"✅ {example_name} completed successfully")
-        except Exception as e:
-            print(f"❌ {example_name} failed: {str(e)}")
-        
-        print("-" * 60)
+    # One runner for every example, so the engine is started and shut down only once
+    async with SimpleRunner() as runner:
+        for example_name, example_func in examples:
+            try:
+                print(f"\n🎯 Running {example_name}...")
+                await example_func(runner)
+                print(f"✅ {example_name} completed successfully")
+            except Exception as e:
+                print(f"❌ {example_name} failed: {str(e)}")
+            
+            print("-" * 60)
     
     print("\n🎉 Examples completed!")
     print("\n💡 Next steps:")